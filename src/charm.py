@@ -2,49 +2,50 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import hashlib
 import json
 import logging
+import re
 from pathlib import Path
+from typing import TYPE_CHECKING, List
 
 import yaml
-from charmed_kubeflow_chisme.exceptions import GenericCharmRuntimeError
-from charmed_kubeflow_chisme.kubernetes import KubernetesResourceHandler
-from charmed_kubeflow_chisme.lightkube.batch import delete_many
-from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
-from charms.istio_beacon_k8s.v0.service_mesh import ServiceMeshConsumer, UnitPolicy
-from charms.istio_ingress_k8s.v0.istio_ingress_route import (
-    BackendRef,
-    HTTPPathMatch,
-    HTTPRoute,
-    HTTPRouteMatch,
-    IstioIngressRouteConfig,
-    IstioIngressRouteRequirer,
-    Listener,
-    ProtocolType,
-)
 from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
     DASHBOARD_LINK_LOCATIONS,
     KubeflowDashboardLinksProvider,
 )
 from charms.loki_k8s.v1.loki_push_api import LogForwarder
-from charms.observability_libs.v1.kubernetes_service_patch import KubernetesServicePatch
-from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
-from lightkube import ApiError
-from lightkube.generic_resource import load_in_cluster_generic_resources
-from lightkube.models.core_v1 import ServicePort
 from ops import main
-from ops.charm import CharmBase
+from ops.charm import CharmBase, PebbleReadyEvent, UpgradeCharmEvent
+from ops.framework import StoredState
 from ops.model import ActiveStatus, BlockedStatus, MaintenanceStatus, WaitingStatus
 from ops.pebble import ChangeError, Layer
-from serialized_data_interface import NoCompatibleVersions, NoVersionsListed, get_interfaces
 
 from dashboard_links import aggregate_links_as_json
+from grafana_dashboard_provider import IndexedGrafanaDashboardProvider
+from metrics_endpoint_provider import CachedMetricsEndpointProvider
+
+# Every hook runs in a new Python process, so the modules below, which take most of the import
+# time of this charm (eg: lightkube, pydantic and the libraries built on them), are imported by
+# the code paths that use them instead of at module load.  This keeps hooks that do not touch
+# them, such as update-status on a non-leader unit, fast.
+if TYPE_CHECKING:
+    from charmed_kubeflow_chisme.kubernetes import KubernetesResourceHandler
+    from lightkube import Client
+
+    from dashboard_configmap import DashboardConfigMapHandler
 
 K8S_RESOURCE_FILES = [
     "src/templates/auth_manifests.yaml.j2",
 ]
+AUTOSCALING_RESOURCE_FILES = [
+    "src/templates/autoscaling_manifests.yaml.j2",
+]
+TRAFFIC_POLICY_RESOURCE_FILES = [
+    "src/templates/traffic_policy_manifests.yaml.j2",
+    "src/templates/gateway_filters_manifests.yaml.j2",
+]
 SERVICE_CONFIG_FILE = "src/service-config.yaml"
-CONFIGMAP_FILE = "src/templates/configmaps.yaml.j2"
 
 DASHBOARD_LINKS_RELATION_NAME = "links"
 # Map of location to the config field names for that location
@@ -54,8 +55,30 @@ ADDITIONAL_LINKS_CONFIG_NAME = {
 EXTERNAL_LINKS_ORDER_CONFIG_NAME = {
     location: f"{location}-link-order" for location in DASHBOARD_LINK_LOCATIONS
 }
+# libuv bounds the size of its threadpool to this value
+UV_THREADPOOL_SIZE_MAX = 1024
+# Durations accepted by Istio, eg: 500ms, 10s, 1m30s
+ISTIO_DURATION_PATTERN = re.compile(r"^(\d+(\.\d+)?(h|ms|m|s))+$")
 METRICS_PATH = "/prometheus/metrics"  # Source https://github.com/kubeflow/kubeflow/blob/master/components/centraldashboard/app/metrics.ts#L36 # noqa E501
 
+# Set once the generic resources have been loaded in this process, see _load_generic_resources
+_generic_resources_loaded = False
+
+
+def _load_generic_resources(client: "Client"):
+    """Loads the generic resources for the CRDs in the cluster, at most once per process."""
+    global _generic_resources_loaded
+    if not _generic_resources_loaded:
+        from lightkube.generic_resource import load_in_cluster_generic_resources
+
+        load_in_cluster_generic_resources(client)
+        _generic_resources_loaded = True
+
+
+def _join_status_messages(*messages: str) -> str:
+    """Joins the non-empty messages into a single status message."""
+    return "; ".join(message for message in messages if message)
+
 
 class CheckFailed(Exception):
     """Raise this exception if one of the checks in main fails."""
@@ -71,10 +94,20 @@ class CheckFailed(Exception):
 class KubeflowDashboardOperator(CharmBase):
     """A Juju Charm for Kubeflow Dashboard Operator"""
 
+    _stored = StoredState()
+
     def __init__(self, *args):
         super().__init__(*args)
 
         self.logger = logging.getLogger(__name__)
+        self._stored.set_default(
+            reconcile_fingerprint="",
+            reconciles_executed=0,
+            reconciles_skipped=0,
+            autoscaling_resources_applied=False,
+            traffic_policy_resources_applied=False,
+            ingress_route_hash="",
+        )
         self._namespace = self.model.name
         self._lightkube_field_manager = "lightkube"
         self._profiles_service = None
@@ -92,9 +125,14 @@ class KubeflowDashboardOperator(CharmBase):
         self._port = int(self.model.config["port"])
         self._registration_flow = self.model.config["registration-flow"]
         self._k8s_resource_handler = None
+        self._autoscaling_resource_handler = None
+        self._traffic_policy_resource_handler = None
         self._configmap_handler = None
+        self._lightkube_client = None
+        self._context_cache = None
+        self._configmap_data_cache = None
 
-        self.prometheus_provider = MetricsEndpointProvider(
+        self.prometheus_provider = CachedMetricsEndpointProvider(
             charm=self,
             relation_name="metrics-endpoint",
             jobs=[
@@ -104,20 +142,45 @@ class KubeflowDashboardOperator(CharmBase):
                 }
             ],
         )
-        self.dashboard_provider = GrafanaDashboardProvider(self)
-        port = ServicePort(int(self._port), name=f"{self.app.name}")
-        self.service_patcher = KubernetesServicePatch(self, [port])
 
-        # Ambient Mesh integration
+        # The libraries below only manage application-level state (the Grafana dashboards in the
+        # application databag and the mesh and ingress configuration), so they are only created
+        # on the leader.  Followers do not pay for importing them or for the work they do on every
+        # event they observe.  A unit that is elected leader creates them on leader-elected, which
+        # they observe to catch up.
         if self.unit.is_leader():
-            self._mesh = ServiceMeshConsumer(
+            from charms.istio_beacon_k8s.v0.service_mesh import UnitPolicy
+            from charms.istio_ingress_k8s.v0.istio_ingress_route import IstioIngressRouteRequirer
+
+            from service_mesh_consumer import MinimalPatchServiceMeshConsumer
+            from statefulset_resources_patch import (
+                StatefulSetResourcesPatch,
+                get_resource_requirements,
+            )
+
+            self.dashboard_provider = IndexedGrafanaDashboardProvider(self)
+            self.resources_patcher = StatefulSetResourcesPatch(
+                self,
+                self._container_name,
+                resource_reqs_func=lambda: get_resource_requirements(self.model.config),
+                lightkube_client_func=lambda: self.lightkube_client,
+                # A new leader patches the resources to know they are applied
+                refresh_event=[self.on.config_changed, self.on.leader_elected],
+            )
+
+            # Ambient Mesh integration
+            self._mesh = MinimalPatchServiceMeshConsumer(
                 self,
                 policies=[
                     UnitPolicy(relation="metrics-endpoint", ports=[self._port]),
                 ],
+                lightkube_client_func=lambda: self.lightkube_client,
             )
             self.ingress = IstioIngressRouteRequirer(self, relation_name="istio-ingress-route")
-            self._ambient_mesh_ingress()
+            # Emitted when the istio-ingress-route relation changes or breaks
+            self.framework.observe(self.ingress.on.ready, self.main)
+
+            self.framework.observe(self.on.update_status, self._on_update_status)
 
         for event in [
             self.on.install,
@@ -129,6 +192,11 @@ class KubeflowDashboardOperator(CharmBase):
             self.on.kubeflow_dashboard_pebble_ready,
         ]:
             self.framework.observe(event, self.main)
+        # Juju owns the application Service and only removes it with the application, so every
+        # unit opens the port instead of patching the Service, which a unit being removed during
+        # a scale down would otherwise delete
+        for event in [self.on.install, self.on.upgrade_charm, self.on.config_changed]:
+            self.framework.observe(event, self._set_ports)
         self.framework.observe(self.on.remove, self._on_remove)
 
         # Handle the Kubeflow Dashboard links relation
@@ -151,52 +219,223 @@ class KubeflowDashboardOperator(CharmBase):
     def container(self):
         return self._container
 
+    @property
+    def lightkube_client(self) -> "Client":
+        """Returns the lightkube Client shared by everything in this charm, creating it if needed.
+
+        The client's field manager is the application name, matching the one the service mesh
+        library uses.  The resource handlers set their own field manager when applying resources.
+        """
+        if self._lightkube_client is None:
+            from lightkube import Client
+
+            self._lightkube_client = Client(
+                namespace=self._namespace, field_manager=self.model.app.name
+            )
+        return self._lightkube_client
+
     @property
     def _context(self) -> dict:
-        """Returns the context used to create Kubernetes resources."""
-        links = self._get_dashboard_links()
+        """Returns the context used to create Kubernetes resources.
+
+        The context is computed once and reused until _reset_dispatch_cache is called.
+        """
+        if self._context_cache is None:
+            links = self._get_dashboard_links()
+            self._context_cache = {
+                "app_name": self._name,
+                "namespace": self._namespace,
+                "configmap_name": self._configmap_name,
+                "menuLinks": links["menu"],
+                "externalLinks": links["external"],
+                "quickLinks": links["quick"],
+                "documentationItems": links["documentation"],
+                "settings": json.dumps({"DASHBOARD_FORCE_IFRAME": True}),
+            }
+        return self._context_cache
 
-        return {
-            "app_name": self._name,
-            "namespace": self._namespace,
-            "configmap_name": self._configmap_name,
-            "menuLinks": links["menu"],
-            "externalLinks": links["external"],
-            "quickLinks": links["quick"],
-            "documentationItems": links["documentation"],
-            "settings": json.dumps({"DASHBOARD_FORCE_IFRAME": True}),
-        }
+    @property
+    def _configmap_data(self) -> dict:
+        """Returns the data of the dashboard ConfigMap, rendered once from the context.
+
+        Raises:
+            CheckFailed: if the payload does not fit in a Kubernetes object
+        """
+        if self._configmap_data_cache is None:
+            from dashboard_configmap import (
+                ConfigMapTooLargeError,
+                check_payload_size,
+                render_configmap_data,
+            )
+
+            configmap_data = render_configmap_data(self._context)
+            try:
+                check_payload_size(configmap_data)
+            except ConfigMapTooLargeError as e:
+                raise CheckFailed(str(e), BlockedStatus)
+            self._configmap_data_cache = configmap_data
+        return self._configmap_data_cache
+
+    def _reset_dispatch_cache(self):
+        """Drops the context and the ConfigMap data and resource handlers computed from it.
+
+        A dispatch normally handles a single event, but the charm instance can outlive an event
+        (eg: with deferred events or in unit tests), so this is called at the start of the
+        handlers that use the context.
+        """
+        self._context_cache = None
+        self._configmap_data_cache = None
+        self._k8s_resource_handler = None
+        self._autoscaling_resource_handler = None
+        self._traffic_policy_resource_handler = None
+        self._configmap_handler = None
 
     @property
     def k8s_resource_handler(self):
         if not self._k8s_resource_handler:
+            from charmed_kubeflow_chisme.kubernetes import KubernetesResourceHandler
+
             self._k8s_resource_handler = KubernetesResourceHandler(
                 field_manager=self._lightkube_field_manager,
                 template_files=K8S_RESOURCE_FILES,
                 context=self._context,
                 logger=self.logger,
+                lightkube_client=self.lightkube_client,
             )
-        load_in_cluster_generic_resources(self._k8s_resource_handler.lightkube_client)
+            _load_generic_resources(self._k8s_resource_handler.lightkube_client)
         return self._k8s_resource_handler
 
     @k8s_resource_handler.setter
-    def k8s_resource_handler(self, handler: KubernetesResourceHandler):
+    def k8s_resource_handler(self, handler: "KubernetesResourceHandler"):
         self._k8s_resource_handler = handler
 
+    @property
+    def _autoscaling_context(self) -> dict:
+        """Returns the context used to create the autoscaling resources."""
+        return {
+            "app_name": self._name,
+            "namespace": self._namespace,
+            "autoscaling": self.model.config["autoscaling"],
+            "min_replicas": self.model.config["autoscaling-min-replicas"],
+            "max_replicas": self.model.config["autoscaling-max-replicas"],
+            "target_cpu_utilization": self.model.config["autoscaling-target-cpu-utilization"],
+        }
+
+    @property
+    def autoscaling_resource_handler(self):
+        """Returns the handler of the HorizontalPodAutoscaler and PodDisruptionBudget.
+
+        Unlike the other resources, these are deleted when autoscaling is disabled, so they are
+        labelled to be found by KubernetesResourceHandler.reconcile.
+        """
+        if not self._autoscaling_resource_handler:
+            from charmed_kubeflow_chisme.kubernetes import KubernetesResourceHandler
+            from lightkube.resources.autoscaling_v2 import HorizontalPodAutoscaler
+            from lightkube.resources.policy_v1 import PodDisruptionBudget
+
+            self._autoscaling_resource_handler = KubernetesResourceHandler(
+                field_manager=self._lightkube_field_manager,
+                template_files=AUTOSCALING_RESOURCE_FILES,
+                context=self._autoscaling_context,
+                logger=self.logger,
+                labels={
+                    "app.kubernetes.io/instance": f"{self._name}-{self._namespace}",
+                    "kubernetes-resource-handler-scope": "autoscaling",
+                },
+                resource_types={HorizontalPodAutoscaler, PodDisruptionBudget},
+                lightkube_client=self.lightkube_client,
+            )
+        return self._autoscaling_resource_handler
+
+    @autoscaling_resource_handler.setter
+    def autoscaling_resource_handler(self, handler: "KubernetesResourceHandler"):
+        self._autoscaling_resource_handler = handler
+
+    @property
+    def _traffic_policy_enabled(self) -> bool:
+        """Returns True if any of the Istio resources shaping the dashboard traffic is enabled."""
+        config = self.model.config
+        return bool(
+            config["traffic-policy"] or config["compression"] or config["assets-cache-max-age"]
+        )
+
+    @property
+    def _traffic_policy_context(self) -> dict:
+        """Returns the context used to create the Istio resources shaping the dashboard traffic.
+
+        The gateway filters are applied to the gateway of the istio-ingress-route relation, which
+        is named after the application providing it and expected to run in this namespace.
+        """
+        config = self.model.config
+        route_relation = self.model.get_relation("istio-ingress-route")
+        return {
+            "app_name": self._name,
+            "namespace": self._namespace,
+            "traffic_policy": config["traffic-policy"],
+            "connect_timeout": config["traffic-policy-connect-timeout"],
+            "max_connections": config["traffic-policy-max-connections"],
+            "max_pending_requests": config["traffic-policy-max-pending-requests"],
+            "max_retries": config["traffic-policy-max-retries"],
+            "consecutive_5xx_errors": config["traffic-policy-consecutive-5xx-errors"],
+            "base_ejection_time": config["traffic-policy-base-ejection-time"],
+            "gateway_name": (
+                route_relation.app.name if route_relation and route_relation.app else ""
+            ),
+            "compression": config["compression"],
+            "assets_cache_max_age": config["assets-cache-max-age"],
+        }
+
+    @property
+    def traffic_policy_resource_handler(self):
+        """Returns the handler of the DestinationRule and EnvoyFilter of the dashboard.
+
+        Like the autoscaling resources, these are deleted when they are disabled.
+        """
+        if not self._traffic_policy_resource_handler:
+            from charmed_kubeflow_chisme.kubernetes import KubernetesResourceHandler
+            from lightkube.generic_resource import create_namespaced_resource
+
+            destination_rule = create_namespaced_resource(
+                "networking.istio.io", "v1beta1", "DestinationRule", "destinationrules"
+            )
+            envoy_filter = create_namespaced_resource(
+                "networking.istio.io", "v1alpha3", "EnvoyFilter", "envoyfilters"
+            )
+            self._traffic_policy_resource_handler = KubernetesResourceHandler(
+                field_manager=self._lightkube_field_manager,
+                template_files=TRAFFIC_POLICY_RESOURCE_FILES,
+                context=self._traffic_policy_context,
+                logger=self.logger,
+                labels={
+                    "app.kubernetes.io/instance": f"{self._name}-{self._namespace}",
+                    "kubernetes-resource-handler-scope": "traffic-policy",
+                },
+                resource_types={destination_rule, envoy_filter},
+                lightkube_client=self.lightkube_client,
+            )
+        return self._traffic_policy_resource_handler
+
+    @traffic_policy_resource_handler.setter
+    def traffic_policy_resource_handler(self, handler: "KubernetesResourceHandler"):
+        self._traffic_policy_resource_handler = handler
+
     @property
     def configmap_handler(self):
         if not self._configmap_handler:
-            self._configmap_handler = KubernetesResourceHandler(
+            from dashboard_configmap import DashboardConfigMapHandler
+
+            self._configmap_handler = DashboardConfigMapHandler(
                 field_manager=self._lightkube_field_manager,
-                template_files=[CONFIGMAP_FILE],
                 context=self._context,
                 logger=self.logger,
+                lightkube_client=self.lightkube_client,
+                # Reuse the data rendered for the reconcile fingerprint, if any
+                data=self._configmap_data_cache,
             )
-        load_in_cluster_generic_resources(self._k8s_resource_handler.lightkube_client)
         return self._configmap_handler
 
     @configmap_handler.setter
-    def configmap_handler(self, handler: KubernetesResourceHandler):
+    def configmap_handler(self, handler: "DashboardConfigMapHandler"):
         self._configmap_handler = handler
 
     @property
@@ -221,20 +460,40 @@ class KubeflowDashboardOperator(CharmBase):
                         "DASHBOARD_CONFIGMAP": self._configmap_name,
                         "LOGOUT_URL": "/authservice/logout",
                         "POD_NAMESPACE": self.model.name,
+                        **self._nodejs_environment,
                     },
                 }
             },
         }
         return Layer(layer_config)
 
+    @property
+    def _nodejs_environment(self) -> dict:
+        """Returns the environment tuning the Node.js runtime of the workload.
+
+        Both variables are always set, as the layer is merged into the existing plan and a
+        variable left out of it would keep its previous value.
+        """
+        max_old_space_size = self.model.config["nodejs-max-old-space-size"]
+        uv_threadpool_size = self.model.config["uv-threadpool-size"]
+        if max_old_space_size < 0:
+            raise CheckFailed(
+                "nodejs-max-old-space-size must be 0 or a positive number of MiB", BlockedStatus
+            )
+        if not 1 <= uv_threadpool_size <= UV_THREADPOOL_SIZE_MAX:
+            raise CheckFailed(
+                f"uv-threadpool-size must be between 1 and {UV_THREADPOOL_SIZE_MAX}", BlockedStatus
+            )
+        node_options = f"--max-old-space-size={max_old_space_size}" if max_old_space_size else ""
+        return {
+            "NODE_OPTIONS": node_options,
+            "UV_THREADPOOL_SIZE": str(uv_threadpool_size),
+        }
+
     def _check_container_connection(self):
         if not self.container.can_connect():
             raise CheckFailed("Pod startup is not complete", MaintenanceStatus)
 
-    def _check_leader(self):
-        if not self.unit.is_leader():
-            raise CheckFailed("Waiting for leadership", WaitingStatus)
-
     def _update_layer(self) -> None:
         """Updates the Pebble configuration layer if changed."""
         current_layer = self.container.get_plan()
@@ -246,9 +505,17 @@ class KubeflowDashboardOperator(CharmBase):
                 self.logger.info("Pebble plan updated with new configuration, replaning")
                 self.container.replan()
             except ChangeError as e:
+                from charmed_kubeflow_chisme.exceptions import GenericCharmRuntimeError
+
                 raise GenericCharmRuntimeError("Failed to replan") from e
 
     def _get_interfaces(self):
+        from serialized_data_interface import (
+            NoCompatibleVersions,
+            NoVersionsListed,
+            get_interfaces,
+        )
+
         try:
             interfaces = get_interfaces(self)
         except NoVersionsListed as err:
@@ -257,19 +524,42 @@ class KubeflowDashboardOperator(CharmBase):
             raise CheckFailed(err, BlockedStatus)
         return interfaces
 
+    @property
+    def _ingress_data(self) -> dict:
+        """Returns the data sent over the sidecar `ingress` relation."""
+        return {
+            "prefix": "/",
+            "rewrite": "/",
+            "service": self.model.app.name,
+            "port": self._port,
+            "namespace": self._namespace,
+        }
+
     def _handle_ingress(self, interfaces):
         if interfaces["ingress"]:
-            interfaces["ingress"].send_data(
-                {
-                    "prefix": "/",
-                    "rewrite": "/",
-                    "service": self.model.app.name,
-                    "port": self._port,
-                    "namespace": self._namespace,
-                }
-            )
+            interfaces["ingress"].send_data(self._ingress_data)
 
     def _ambient_mesh_ingress(self):
+        """Submits the route config over the istio-ingress-route relations, if it changed.
+
+        The config is only written to the relations when it, or the relations, differ from the
+        ones it was last submitted with.
+        """
+        relation_ids = [relation.id for relation in self.model.relations["istio-ingress-route"]]
+        if not relation_ids:
+            self._stored.ingress_route_hash = ""
+            return
+
+        from charms.istio_ingress_k8s.v0.istio_ingress_route import (
+            BackendRef,
+            HTTPPathMatch,
+            HTTPRoute,
+            HTTPRouteMatch,
+            IstioIngressRouteConfig,
+            Listener,
+            ProtocolType,
+        )
+
         # ambient mesh
         if self.ingress.tls_enabled:
             http_listener = Listener(port=443, protocol=ProtocolType.HTTP)
@@ -289,8 +579,133 @@ class KubeflowDashboardOperator(CharmBase):
             ],
         )
 
-        if self.unit.is_leader():
-            self.ingress.submit_config(config)
+        submitted_state = json.dumps(
+            {"relation_ids": relation_ids, "config": config.model_dump_json()}, sort_keys=True
+        )
+        route_hash = hashlib.sha256(submitted_state.encode("utf-8")).hexdigest()
+        if route_hash == self._stored.ingress_route_hash:
+            self.logger.debug("Ingress route config unchanged, not submitting it")
+            return
+        self.ingress.submit_config(config)
+        self._stored.ingress_route_hash = route_hash
+
+    def _get_resources_status_message(self) -> str:
+        """Returns the container resources applied to the StatefulSet, as shown in the status.
+
+        The resources are applied by the leader, see StatefulSetResourcesPatch, so they are only
+        reported by the leader, once the patch applied them.
+        """
+        from statefulset_resources_patch import (
+            format_resource_requirements,
+            get_resource_requirements,
+        )
+
+        try:
+            resource_reqs = get_resource_requirements(self.model.config)
+        except ValueError as e:
+            raise CheckFailed(str(e), BlockedStatus)
+        # A unit elected leader during this dispatch creates the patcher from the next one
+        if not self.unit.is_leader() or not hasattr(self, "resources_patcher"):
+            return ""
+        if self.resources_patcher.failure:
+            raise CheckFailed(
+                f"Failed to patch the container resources: {self.resources_patcher.failure}",
+                BlockedStatus,
+            )
+        if not self.resources_patcher.is_applied(resource_reqs):
+            return ""
+        return format_resource_requirements(resource_reqs)
+
+    def _check_autoscaling_config(self):
+        """Checks the autoscaling config is valid, if autoscaling is enabled."""
+        config = self.model.config
+        if not config["autoscaling"]:
+            return
+        if not config["cpu-request"].strip():
+            raise CheckFailed("autoscaling requires cpu-request to be set", BlockedStatus)
+        min_replicas = config["autoscaling-min-replicas"]
+        if not 1 <= min_replicas <= config["autoscaling-max-replicas"]:
+            raise CheckFailed(
+                "autoscaling-min-replicas must be between 1 and autoscaling-max-replicas",
+                BlockedStatus,
+            )
+        if config["autoscaling-target-cpu-utilization"] < 1:
+            raise CheckFailed(
+                "autoscaling-target-cpu-utilization must be greater than 0", BlockedStatus
+            )
+
+    def _check_traffic_policy_config(self):
+        """Checks the config of the Istio resources shaping the dashboard traffic is valid."""
+        config = self.model.config
+        if config["assets-cache-max-age"] < 0:
+            raise CheckFailed("assets-cache-max-age must not be negative", BlockedStatus)
+        gateway_filters = config["compression"] or config["assets-cache-max-age"]
+        if gateway_filters and not self.model.relations["istio-ingress-route"]:
+            self.logger.warning(
+                "compression and assets-cache-max-age only apply to the istio-ingress-route "
+                "gateway, which is not related"
+            )
+        if not config["traffic-policy"]:
+            return
+        for name in [
+            "traffic-policy-max-connections",
+            "traffic-policy-max-pending-requests",
+            "traffic-policy-max-retries",
+        ]:
+            if config[name] < 1:
+                raise CheckFailed(f"{name} must be greater than 0", BlockedStatus)
+        if config["traffic-policy-consecutive-5xx-errors"] < 0:
+            raise CheckFailed(
+                "traffic-policy-consecutive-5xx-errors must not be negative", BlockedStatus
+            )
+        for name in ["traffic-policy-connect-timeout", "traffic-policy-base-ejection-time"]:
+            if not ISTIO_DURATION_PATTERN.match(config[name]):
+                raise CheckFailed(
+                    f"{name} '{config[name]}' is not a valid duration", BlockedStatus
+                )
+
+    def _get_autoscaling_status_message(self) -> str:
+        """Returns a message reporting that the HPA and the Juju scale disagree, if they do.
+
+        The HorizontalPodAutoscaler scales the StatefulSet created by Juju, which is not aware of
+        it, so the number of replicas it wants is compared with the number of units planned by
+        Juju.
+        """
+        if not self.unit.is_leader() or not self.model.config["autoscaling"]:
+            return ""
+        from lightkube import ApiError
+        from lightkube.resources.autoscaling_v2 import HorizontalPodAutoscaler
+
+        try:
+            hpa = self.lightkube_client.get(
+                HorizontalPodAutoscaler, self._name, namespace=self._namespace
+            )
+        except ApiError as e:
+            if e.status.code != 404:
+                self.logger.warning(f"Failed to get the HorizontalPodAutoscaler: {e}")
+            return ""
+        desired_replicas = hpa.status.desiredReplicas if hpa.status else None
+        planned_units = self.app.planned_units()
+        if desired_replicas is None or desired_replicas == planned_units:
+            return ""
+        self.logger.warning(
+            f"The HorizontalPodAutoscaler wants {desired_replicas} replicas while Juju plans "
+            f"{planned_units} units, consider running `juju scale-application`"
+        )
+        return f"HPA wants {desired_replicas} units, Juju scale is {planned_units}"
+
+    def _on_update_status(self, _):
+        """Refreshes the report of the HPA and Juju scale in the leader's status."""
+        if not self.model.config["autoscaling"] or not isinstance(self.unit.status, ActiveStatus):
+            return
+        try:
+            status_message = self._get_resources_status_message()
+        except CheckFailed as e:
+            self.model.unit.status = e.status
+            return
+        self.model.unit.status = ActiveStatus(
+            _join_status_messages(status_message, self._get_autoscaling_status_message())
+        )
 
     def _check_istio_relations(self):
         """Check that both ambient and sidecar relations are not present simultaneously."""
@@ -320,21 +735,35 @@ class KubeflowDashboardOperator(CharmBase):
         return kf_profiles
 
     def _deploy_k8s_resources(self) -> None:
+        from charmed_kubeflow_chisme.exceptions import GenericCharmRuntimeError
+        from lightkube import ApiError
+
+        from dashboard_configmap import ConfigMapTooLargeError
+
         try:
             self.unit.status = MaintenanceStatus("Creating k8s resources")
             self.k8s_resource_handler.apply()
             self.configmap_handler.apply()
+            # The autoscaling resources are only reconciled once they have been enabled, which
+            # saves listing them on every reconcile otherwise
+            if self.model.config["autoscaling"] or self._stored.autoscaling_resources_applied:
+                self.autoscaling_resource_handler.reconcile()
+                self._stored.autoscaling_resources_applied = self.model.config["autoscaling"]
+            if self._traffic_policy_enabled or self._stored.traffic_policy_resources_applied:
+                self.traffic_policy_resource_handler.reconcile()
+                self._stored.traffic_policy_resources_applied = self._traffic_policy_enabled
+        except ConfigMapTooLargeError as e:
+            raise CheckFailed(str(e), BlockedStatus)
         except ApiError as e:
             raise GenericCharmRuntimeError("Failed to create K8S resources") from e
         self.model.unit.status = ActiveStatus()
 
     def _get_dashboard_links(self):
+        links_from_relation = self.dashboard_link_provider.get_dashboard_links_by_location()
         links = {}
         for location in DASHBOARD_LINK_LOCATIONS:
             links[location] = aggregate_links_as_json(
-                links_from_relation=self.dashboard_link_provider.get_dashboard_links(
-                    location=location
-                ),
+                links_from_relation=links_from_relation[location],
                 additional_link_config=self.model.config[ADDITIONAL_LINKS_CONFIG_NAME[location]],
                 link_order_config=self.model.config[EXTERNAL_LINKS_ORDER_CONFIG_NAME[location]],
                 location=location,
@@ -344,31 +773,132 @@ class KubeflowDashboardOperator(CharmBase):
     def _get_data_from_profiles_interface(self, kf_profiles_interface):
         return list(kf_profiles_interface.get_data().values())[0]
 
-    def main(self, _) -> None:
-        """Main entry point for the Charm."""
+    def _render_templates(self, template_files: List[str], context: dict) -> List[str]:
+        """Renders the given Jinja templates with context, returning the raw manifests."""
+        from jinja2 import Template
+
+        return [
+            Template(Path(template_file).read_text()).render(**context)
+            for template_file in template_files
+        ]
+
+    def _reconcile_fingerprint(self, interfaces) -> str:
+        """Returns a hash of the desired state applied by a reconcile.
+
+        On every unit, the fingerprint covers the Pebble layer.  On the leader, it also covers
+        the rendered Kubernetes manifests and the payload sent over the ingress relation
+        (including the ids of the relations it is sent to), so any change to the inputs of main()
+        results in a different fingerprint.  The istio-ingress-route config is submitted before
+        the reconcile, on change, see _ambient_mesh_ingress.
+        """
+        desired_state = {
+            "leader": self.unit.is_leader(),
+            "layer": self._kubeflow_dashboard_operator_layer.to_dict(),
+        }
+        if self.unit.is_leader():
+            desired_state["configmap"] = self._configmap_data
+            desired_state["manifests"] = self._render_templates(K8S_RESOURCE_FILES, self._context)
+            desired_state["autoscaling_manifests"] = self._render_templates(
+                AUTOSCALING_RESOURCE_FILES, self._autoscaling_context
+            )
+            desired_state["traffic_policy_manifests"] = self._render_templates(
+                TRAFFIC_POLICY_RESOURCE_FILES, self._traffic_policy_context
+            )
+            desired_state["ingress"] = (
+                {
+                    "relation_ids": [relation.id for relation in self.model.relations["ingress"]],
+                    "data": self._ingress_data,
+                }
+                if interfaces["ingress"]
+                else None
+            )
+        serialized_state = json.dumps(desired_state, sort_keys=True)
+        return hashlib.sha256(serialized_state.encode("utf-8")).hexdigest()
+
+    def _is_reconcile_required(self, event, fingerprint: str) -> bool:
+        """Returns True if main() needs to apply the desired state described by fingerprint.
+
+        A reconcile is always executed on pebble-ready and upgrade-charm, because the workload
+        container may have been restarted and lost its Pebble plan without the desired state
+        having changed.
+        """
+        if isinstance(event, (PebbleReadyEvent, UpgradeCharmEvent)):
+            return True
+        return fingerprint != self._stored.reconcile_fingerprint
+
+    def main(self, event) -> None:
+        """Main entry point for the Charm.
+
+        Every unit configures and starts its workload from the kubeflow-profiles relation data,
+        so the application can be scaled out.  Only the leader applies the cluster-scoped
+        resources, the dashboard ConfigMap and the ingress relation data.
+        """
+        self._reset_dispatch_cache()
         try:
-            self._check_container_connection()
-            self._check_leader()
             self._check_istio_relations()
+            if self.unit.is_leader():
+                # The route only depends on the relation, so it is not held back by the workload
+                self._ambient_mesh_ingress()
+            self._check_container_connection()
+            status_message = self._get_resources_status_message()
+            self._check_autoscaling_config()
+            self._check_traffic_policy_config()
             interfaces = self._get_interfaces()
             kf_profiles_interface = self._check_kf_profiles(interfaces)
-            self._handle_ingress(interfaces)
-            self._deploy_k8s_resources()
             kf_profiles = self._get_data_from_profiles_interface(kf_profiles_interface)
             self.profiles_service = kf_profiles["service-name"]
+            fingerprint = self._reconcile_fingerprint(interfaces)
+            if not self._is_reconcile_required(event, fingerprint):
+                self._stored.reconciles_skipped += 1
+                self.logger.debug(
+                    "Desired state unchanged, skipping reconcile "
+                    f"(executed: {self._stored.reconciles_executed}, "
+                    f"skipped: {self._stored.reconciles_skipped})"
+                )
+                self.model.unit.status = ActiveStatus(
+                    _join_status_messages(status_message, self._get_autoscaling_status_message())
+                )
+                return
+            if self.unit.is_leader():
+                self._handle_ingress(interfaces)
+                self._deploy_k8s_resources()
             self._update_layer()
+            self._stored.reconcile_fingerprint = fingerprint
+            self._stored.reconciles_executed += 1
+            self.logger.debug(
+                "Reconcile completed "
+                f"(executed: {self._stored.reconciles_executed}, "
+                f"skipped: {self._stored.reconciles_skipped})"
+            )
         except CheckFailed as e:
             self.model.unit.status = e.status
             return
-        self.model.unit.status = ActiveStatus()
+        self.model.unit.status = ActiveStatus(
+            _join_status_messages(status_message, self._get_autoscaling_status_message())
+        )
+
+    def _set_ports(self, _):
+        """Opens the workload port on the application Service."""
+        self.unit.set_ports(int(self.model.config["port"]))
 
     def _on_remove(self, _):
+        if self.app.planned_units() > 0:
+            # Other units keep serving the dashboard, so the shared resources must be kept
+            self.logger.info("Application is being scaled down, keeping k8s resources")
+            return
+        from charmed_kubeflow_chisme.lightkube.batch import delete_many
+        from lightkube import ApiError
+
         self.unit.status = MaintenanceStatus("Removing k8s resources")
         k8s_resources_manifests = self.k8s_resource_handler.render_manifests()
         configmap_manifest = self.configmap_handler.render_manifests()
         try:
             delete_many(self.k8s_resource_handler.lightkube_client, k8s_resources_manifests)
             delete_many(self.configmap_handler.lightkube_client, configmap_manifest)
+            if self.model.config["autoscaling"] or self._stored.autoscaling_resources_applied:
+                self.autoscaling_resource_handler.delete()
+            if self._traffic_policy_enabled or self._stored.traffic_policy_resources_applied:
+                self.traffic_policy_resource_handler.delete()
         except ApiError as e:
             self.logger.warning(f"Failed to delete resources, with error: {e}")
             raise e
@@ -0,0 +1,145 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Tools for rendering and applying the Kubeflow Dashboard ConfigMap."""
+import io
+import json
+import logging
+from typing import Dict, List, Optional, TextIO
+
+from charmed_kubeflow_chisme.lightkube.batch import apply_many
+from lightkube import Client
+from lightkube.models.meta_v1 import ObjectMeta
+from lightkube.resources.core_v1 import ConfigMap
+
+logger = logging.getLogger(__name__)
+
+# Kubernetes rejects objects larger than 1 MiB, see
+# https://kubernetes.io/docs/concepts/configuration/configmap/#motivation
+MAX_CONFIGMAP_SIZE_BYTES = 1024 * 1024
+# Keys of the `links` document read by centraldashboard, which are also the charm context keys
+# holding the JSON-serialized links
+LINKS_DOCUMENT_KEYS = ("menuLinks", "externalLinks", "quickLinks", "documentationItems")
+DASHBOARD_SETTINGS = "{'DASHBOARD_FORCE_IFRAME': true}"
+
+
+class ConfigMapTooLargeError(Exception):
+    """Raised when the rendered dashboard ConfigMap exceeds the Kubernetes object size limit."""
+
+    def __init__(self, size: int):
+        super().__init__(
+            f"Dashboard ConfigMap payload is {size} bytes, exceeding the "
+            f"{MAX_CONFIGMAP_SIZE_BYTES} bytes limit"
+        )
+        self.size = size
+
+
+def write_links_document(stream: TextIO, context: dict):
+    """Writes the `links` document of the dashboard ConfigMap to a text stream.
+
+    The links for each location are written as-is from the JSON strings in the context, so the
+    document is assembled without parsing or re-serializing any link.
+
+    Args:
+        stream: text stream to write the document to
+        context: charm context holding the JSON-serialized links for each key of
+                 LINKS_DOCUMENT_KEYS
+    """
+    stream.write("{")
+    for i, key in enumerate(LINKS_DOCUMENT_KEYS):
+        if i:
+            stream.write(", ")
+        stream.write(json.dumps(key))
+        stream.write(": ")
+        stream.write(context[key])
+    stream.write("}")
+
+
+def render_configmap_data(context: dict) -> Dict[str, str]:
+    """Returns the data of the dashboard ConfigMap, logging the size of its payload."""
+    with io.StringIO() as stream:
+        write_links_document(stream, context)
+        data = {"links": stream.getvalue(), "settings": DASHBOARD_SETTINGS}
+
+    logger.debug(f"Rendered dashboard ConfigMap payload of {get_payload_size(data)} bytes")
+    return data
+
+
+def get_payload_size(data: Dict[str, str]) -> int:
+    """Returns the size in bytes of the keys and values of a ConfigMap's data."""
+    return sum(
+        len(key.encode("utf-8")) + len(value.encode("utf-8")) for key, value in data.items()
+    )
+
+
+def check_payload_size(data: Dict[str, str]):
+    """Checks that a ConfigMap's data fits in a Kubernetes object.
+
+    Raises:
+        ConfigMapTooLargeError: if the payload exceeds MAX_CONFIGMAP_SIZE_BYTES
+    """
+    size = get_payload_size(data)
+    if size > MAX_CONFIGMAP_SIZE_BYTES:
+        raise ConfigMapTooLargeError(size)
+
+
+class DashboardConfigMapHandler:
+    """Renders and applies the dashboard ConfigMap without going through a Jinja template.
+
+    This exposes the subset of the KubernetesResourceHandler API used by the charm
+    (render_manifests, apply and lightkube_client).  The ConfigMap data is rendered from the
+    context, unless it was already rendered by the caller and given as data.
+    """
+
+    def __init__(
+        self,
+        field_manager: str,
+        context: dict,
+        logger: Optional[logging.Logger] = None,
+        lightkube_client: Optional[Client] = None,
+        data: Optional[Dict[str, str]] = None,
+    ):
+        self._field_manager = field_manager
+        self._context = context
+        self._data = data
+        self.log = logger or logging.getLogger(__name__)
+        self._lightkube_client = lightkube_client
+        self._manifests = None
+
+    @property
+    def lightkube_client(self) -> Client:
+        """Returns the Lightkube Client used by this instance, creating it if needed."""
+        if self._lightkube_client is None:
+            self._lightkube_client = Client(field_manager=self._field_manager)
+        return self._lightkube_client
+
+    def render_manifests(self) -> List[ConfigMap]:
+        """Renders the dashboard ConfigMap as a list of Lightkube resources."""
+        if self._manifests is None:
+            self._manifests = [
+                ConfigMap(
+                    metadata=ObjectMeta(
+                        name=self._context["configmap_name"],
+                        namespace=self._context["namespace"],
+                    ),
+                    data=self._data or render_configmap_data(self._context),
+                )
+            ]
+        return self._manifests
+
+    def apply(self):
+        """Applies the dashboard ConfigMap using server-side-apply.
+
+        Raises:
+            ConfigMapTooLargeError: if the payload exceeds MAX_CONFIGMAP_SIZE_BYTES
+        """
+        resources = self.render_manifests()
+        for resource in resources:
+            check_payload_size(resource.data)
+        self.log.debug(f"Applying {len(resources)} resources")
+        apply_many(
+            client=self.lightkube_client,
+            objs=resources,
+            field_manager=self._field_manager,
+            force=True,
+            logger=self.log,
+        )
@@ -1,8 +1,10 @@
 # Copyright 2023 Canonical Ltd.
 # See LICENSE file for licensing details.
 """Tools for managing dashboard links from relations and charm config."""
+import json
 import logging
-from typing import List
+from collections import defaultdict
+from typing import Any, List, Tuple
 
 import yaml
 from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
@@ -12,6 +14,17 @@ from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
 
 logger = logging.getLogger(__name__)
 
+# Names of the loaders used by load_config_value, from fastest to slowest
+CONFIG_LOADER_JSON = "json"
+CONFIG_LOADER_LIBYAML = "libyaml"
+CONFIG_LOADER_YAML = "yaml"
+# Use the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADERS = (
+    (CONFIG_LOADER_LIBYAML, yaml.CSafeLoader)
+    if getattr(yaml, "__with_libyaml__", False)
+    else (CONFIG_LOADER_YAML, yaml.SafeLoader)
+)
+
 
 def aggregate_links(
     links_from_relation: List[DashboardLink],
@@ -79,7 +92,7 @@ def parse_dashboard_link_config(config: str, location: str):
         return []
 
     try:
-        links = yaml.safe_load(config)
+        links, _ = load_config_value(config)
     except yaml.YAMLError as err:
         logger.warning(f"{error_message}  Got error: {err}")
         return []
@@ -108,7 +121,7 @@ def parse_dashboard_link_order(config: str) -> List[str]:
     )
 
     try:
-        ordering = yaml.safe_load(config)
+        ordering, _ = load_config_value(config)
     except Exception as err:
         logger.warning(f"{error_message}  Got error: {err}")
         return []
@@ -125,6 +138,29 @@ def parse_dashboard_link_order(config: str) -> List[str]:
     return ordering
 
 
+def load_config_value(config: str) -> Tuple[Any, str]:
+    """Loads a YAML or JSON formatted config value, returning the value and the loader used.
+
+    Config values are most often JSON, so this first tries the json module and only falls back
+    to a YAML loader, using the libyaml-backed yaml.CSafeLoader when available and the
+    pure-Python yaml.SafeLoader otherwise.  The name of the loader that handled the value
+    (one of CONFIG_LOADER_JSON, CONFIG_LOADER_LIBYAML or CONFIG_LOADER_YAML) is returned and
+    logged at debug level.
+
+    Raises:
+        yaml.YAMLError: if the config value is neither valid JSON nor valid YAML
+    """
+    try:
+        value = json.loads(config)
+        loader_name = CONFIG_LOADER_JSON
+    except ValueError:
+        loader_name, loader = _YAML_LOADERS
+        value = yaml.load(config, Loader=loader)
+
+    logger.debug(f"Loaded config value with the {loader_name} loader")
+    return value, loader_name
+
+
 def sort_dashboard_links(dashboard_links: List[DashboardLink], preferred_link_order: List[str]):
     """Sorts a list of DashboardLinks by their link text, moving preferred links to the top.
 
@@ -170,16 +206,18 @@ def sort_dashboard_links(dashboard_links: List[DashboardLink], preferred_link_or
     Returns:
         Ordered list of DashboardLinks
     """
+    # Index the links by text, keeping links that share a text in their input order
+    dashboard_links_by_text = defaultdict(list)
+    for dashboard_link in dashboard_links:
+        dashboard_links_by_text[dashboard_link.text].append(dashboard_link)
+
     ordered_dashboard_links = []
-    removed_dashboard_links_index = set()
     for preferred_link in preferred_link_order:
-        for i, dashboard_link in enumerate(dashboard_links):
-            if dashboard_link.text == preferred_link:
-                ordered_dashboard_links.append(dashboard_link)
-                removed_dashboard_links_index.add(i)
+        ordered_dashboard_links.extend(dashboard_links_by_text.get(preferred_link, []))
 
+    preferred_link_texts = set(preferred_link_order)
     remaining_dashboard_links = [
-        item for i, item in enumerate(dashboard_links) if i not in removed_dashboard_links_index
+        item for item in dashboard_links if item.text not in preferred_link_texts
     ]
     remaining_dashboard_links = sorted(remaining_dashboard_links, key=lambda item: item.text)
 
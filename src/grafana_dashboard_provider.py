@@ -0,0 +1,142 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""GrafanaDashboardProvider that only re-encodes and re-sends dashboards that changed."""
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from charms.grafana_k8s.v0.grafana_dashboard import CharmedDashboard, GrafanaDashboardProvider
+from ops.charm import CharmBase, HookEvent, RelationCreatedEvent
+from ops.model import Relation
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_FILE_SUFFIXES = (".json", ".json.tmpl", ".tmpl")
+
+
+def get_dashboard_files_index(
+    dashboards_path: Path, inject_dropdowns: bool, juju_topology: dict
+) -> Dict[str, str]:
+    """Returns a map of dashboard file name to a hash of what its encoded dashboard depends on.
+
+    The encoded dashboard depends on the file content, on whether topology dropdowns are
+    injected and on the Juju topology of the unit encoding it.
+
+    Args:
+        dashboards_path: directory holding the dashboard files, as loaded by
+                         CharmedDashboard.load_dashboards_from_dir
+        inject_dropdowns: whether topology dropdowns are added to the dashboards
+        juju_topology: Juju topology added to the dashboards
+    """
+    encoding_inputs = json.dumps(
+        {"inject_dropdowns": inject_dropdowns, "juju_topology": juju_topology}, sort_keys=True
+    ).encode("utf-8")
+    index = {}
+    for path in sorted(Path(dashboards_path).glob("*")):
+        if path.is_file() and path.name.endswith(DASHBOARD_FILE_SUFFIXES):
+            index[path.name] = hashlib.sha256(encoding_inputs + path.read_bytes()).hexdigest()
+    return index
+
+
+def _stored_to_builtin(obj: Any) -> Any:
+    """Converts the StoredDict and StoredList values of StoredState for json.dumps."""
+    return dict(obj) if isinstance(obj, Mapping) else list(obj)
+
+
+class IndexedGrafanaDashboardProvider(GrafanaDashboardProvider):
+    """GrafanaDashboardProvider keeping a content-hash index over its dashboards directory.
+
+    GrafanaDashboardProvider re-encodes every dashboard file and rewrites every relation each
+    time it scans the dashboards directory (eg: on every config-changed).  This stores a hash of
+    each dashboard file next to the encoded dashboards, so only new or changed files are encoded
+    again, and the hash of the dashboards last sent over each relation, so a relation is only
+    written when the dashboards sent over it changed.
+    """
+
+    def __init__(self, charm: CharmBase, *args, **kwargs):
+        super().__init__(charm, *args, **kwargs)
+        self._stored.set_default(  # type: ignore
+            dashboard_files_index={}, sent_dashboards_hashes={}
+        )
+
+    def _update_all_dashboards_from_dir(
+        self, _: Optional[HookEvent] = None, inject_dropdowns: bool = True
+    ) -> None:
+        """Encodes the changed dashboard files, sending the dashboards if they changed."""
+        if not self._dashboards_path:
+            return
+
+        stored_index = self._stored.dashboard_files_index  # type: ignore
+        index = get_dashboard_files_index(
+            Path(self._dashboards_path), inject_dropdowns, self._juju_topology
+        )
+        changed_files = {
+            name for name, digest in index.items() if stored_index.get(name) != digest
+        }
+        stored_dashboard_templates = self._stored.dashboard_templates  # type: ignore
+        # Templates of changed files are encoded again, and those of files that are gone (or
+        # that were stored without an index entry) are dropped, as in GrafanaDashboardProvider
+        current_ids = {f"file:{Path(name).stem}" for name in index.keys() - changed_files}
+        outdated_ids = [
+            dashboard_id
+            for dashboard_id in stored_dashboard_templates.keys()
+            if dashboard_id.startswith("file:") and dashboard_id not in current_ids
+        ]
+
+        if changed_files or outdated_ids:
+            for dashboard_id in outdated_ids:
+                del stored_dashboard_templates[dashboard_id]
+            stored_dashboard_templates.update(
+                CharmedDashboard.load_dashboards_from_dir(
+                    dashboards_path=Path(self._dashboards_path),
+                    charm_name=self._charm.meta.name,
+                    charm_dir=self._charm.charm_dir,
+                    inject_dropdowns=inject_dropdowns,
+                    juju_topology=self._juju_topology,
+                    path_filter=lambda path: path.name in changed_files,
+                )
+            )
+            self._stored.dashboard_files_index = index  # type: ignore
+        logger.debug(f"Encoded {len(changed_files)} of {len(index)} dashboard files")
+
+        if self._charm.unit.is_leader():
+            self._send_dashboards_if_changed()
+
+    def _on_grafana_dashboard_relation_created(self, event: RelationCreatedEvent) -> None:
+        """Sends the dashboards over a new relation, once."""
+        if self._charm.unit.is_leader():
+            self._update_all_dashboards_from_dir()
+
+    def _send_dashboards_if_changed(self) -> None:
+        """Writes the dashboards to the relations they were not sent to yet."""
+        relations = self._charm.model.relations[self._relation_name]
+        sent_hashes = self._stored.sent_dashboards_hashes  # type: ignore
+        # Forget the relations that are gone
+        for relation_id in set(sent_hashes.keys()) - {str(relation.id) for relation in relations}:
+            del sent_hashes[relation_id]
+
+        dashboards_hash = self._get_dashboards_hash()
+        for relation in relations:
+            if sent_hashes.get(str(relation.id)) == dashboards_hash:
+                logger.debug(f"Dashboards unchanged for relation {relation.id}, not sending them")
+                continue
+            self._upset_dashboards_on_relation(relation)
+
+    def _upset_dashboards_on_relation(self, relation: Relation) -> None:
+        """Updates the dashboards in the relation data, recording the hash of what was sent."""
+        super()._upset_dashboards_on_relation(relation)
+        self._stored.sent_dashboards_hashes[str(relation.id)] = (  # type: ignore
+            self._get_dashboards_hash()
+        )
+
+    def _get_dashboards_hash(self) -> str:
+        """Returns a hash of all the encoded dashboards sent over the relations."""
+        serialized_templates = json.dumps(
+            self._stored.dashboard_templates,  # type: ignore
+            default=_stored_to_builtin,
+            sort_keys=True,
+        )
+        return hashlib.sha256(serialized_templates.encode("utf-8")).hexdigest()
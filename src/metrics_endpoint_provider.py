@@ -0,0 +1,104 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""MetricsEndpointProvider that reuses the loaded alert rules and skips unchanged writes."""
+import hashlib
+import importlib.metadata
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from charms.prometheus_k8s.v0 import prometheus_scrape
+from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
+from cosl.rules import AlertRules, generic_alert_groups
+from ops.framework import StoredState
+
+logger = logging.getLogger(__name__)
+
+
+def get_alert_rules_hash(alert_rules_path: Optional[str], topology: Dict[str, str]) -> str:
+    """Returns a hash of everything the alert rules sent by MetricsEndpointProvider depend on.
+
+    This covers the name and content of every file under alert_rules_path, the Juju topology the
+    rules are labelled with, the generic application rules added to them and the versions of the
+    prometheus_scrape library and of cosl, which load and label the rules.
+    """
+    digest = hashlib.sha256()
+    library_versions = {
+        "prometheus_scrape": [prometheus_scrape.LIBAPI, prometheus_scrape.LIBPATCH],
+        "cosl": importlib.metadata.version("cosl"),
+    }
+    digest.update(json.dumps(library_versions, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(topology, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(generic_alert_groups.application_rules, sort_keys=True).encode())
+    if alert_rules_path and Path(alert_rules_path).is_dir():
+        for path in sorted(Path(alert_rules_path).rglob("*")):
+            if path.is_file():
+                digest.update(str(path.relative_to(alert_rules_path)).encode("utf-8"))
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_changed_data(databag, data: Dict[str, str]) -> Dict[str, str]:
+    """Returns the items of data whose value differs from the one in databag."""
+    return {key: value for key, value in data.items() if databag.get(key) != value}
+
+
+class CachedMetricsEndpointProvider(MetricsEndpointProvider):
+    """MetricsEndpointProvider reusing its alert rules while their sources are unchanged.
+
+    MetricsEndpointProvider loads, labels and serializes the alert rules, then rewrites the
+    `alert_rules`, `scrape_jobs` and `scrape_metadata` of every relation each time it sets the
+    scrape job spec.  This stores the serialized alert rules with the hash of the files they
+    are loaded from, so they are only loaded again when the hash changes, and only writes the
+    relation data that differs from what is already in the databag.
+    """
+
+    _stored = StoredState()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stored.set_default(alert_rules_hash="", alert_rules_json="")
+
+    def set_scrape_job_spec(self, _=None):
+        """Ensure scrape target information is made available to prometheus.
+
+        Behaves like MetricsEndpointProvider.set_scrape_job_spec, without loading the alert rules
+        if they did not change and without writing relation data that did not change.
+        """
+        self._set_unit_ip()
+
+        if not self._charm.unit.is_leader():
+            return
+
+        app_data = {
+            "scrape_metadata": json.dumps(self._scrape_metadata),
+            "scrape_jobs": json.dumps(self._scrape_jobs),
+            "alert_rules": self._get_alert_rules_json(),
+        }
+        for relation in self._charm.model.relations[self._relation_name]:
+            databag = relation.data[self._charm.app]
+            changed_data = get_changed_data(databag, app_data)
+            logger.debug(
+                f"Updating {sorted(changed_data)} in relation {relation.id}, "
+                f"{len(app_data) - len(changed_data)} keys unchanged"
+            )
+            databag.update(changed_data)
+
+    def _get_alert_rules_json(self) -> str:
+        """Returns the serialized alert rules, only loading them if their sources changed."""
+        if not self._forward_alert_rules:
+            return json.dumps(AlertRules(query_type="promql", topology=self.topology).as_dict())
+
+        alert_rules_hash = get_alert_rules_hash(self._alert_rules_path, self.topology.as_dict())
+        if alert_rules_hash != self._stored.alert_rules_hash:
+            alert_rules = AlertRules(query_type="promql", topology=self.topology)
+            alert_rules.add_path(self._alert_rules_path, recursive=True)
+            alert_rules.add(
+                generic_alert_groups.application_rules, group_name_prefix=self.topology.identifier
+            )
+            self._stored.alert_rules_json = json.dumps(alert_rules.as_dict())
+            self._stored.alert_rules_hash = alert_rules_hash
+        else:
+            logger.debug("Alert rules unchanged, reusing the stored alert rules")
+        return self._stored.alert_rules_json
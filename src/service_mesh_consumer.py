@@ -0,0 +1,231 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""ServiceMeshConsumer that only writes the mesh labels and policies when they change."""
+import hashlib
+import json
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from charms.istio_beacon_k8s.v0.service_mesh import (
+    CMRData,
+    ServiceMeshConsumer,
+    build_mesh_policies,
+)
+from lightkube import ApiError, Client
+from lightkube.models.meta_v1 import ObjectMeta
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.resources.core_v1 import ConfigMap, Service
+from ops.framework import StoredState
+
+logger = logging.getLogger(__name__)
+
+
+def get_labels_patch(
+    current_labels: Optional[Dict[str, str]], patch_labels: Dict[str, Optional[str]]
+) -> Dict[str, Optional[str]]:
+    """Returns the items of patch_labels that would change current_labels.
+
+    A label set to None in patch_labels is to be removed, so it is only part of the result if it
+    is in current_labels.
+    """
+    current_labels = current_labels or {}
+    return {
+        label: value
+        for label, value in patch_labels.items()
+        if (label in current_labels if value is None else current_labels.get(label) != value)
+    }
+
+
+def reconcile_charm_labels(
+    client: Client,
+    app_name: str,
+    namespace: str,
+    label_configmap_name: str,
+    labels: Dict[str, str],
+) -> Tuple[int, int]:
+    """Reconciles the labels put on a charm's Pods (via its StatefulSet) and Service.
+
+    Behaves like the service_mesh library's reconcile_charm_labels, storing the labels it sets in
+    a ConfigMap to know which ones to remove later, but only patches the objects whose labels
+    differ from the desired ones, with only the labels that differ.  In particular, the
+    StatefulSet is not patched when its pod template labels are already the desired ones, which
+    could otherwise roll out its pods.
+
+    Returns:
+        The number of GET and of write (PATCH or create) requests sent to Kubernetes.
+    """
+    gets, writes = 3, 0
+    try:
+        config_map = client.get(ConfigMap, label_configmap_name, namespace=namespace)
+    except ApiError as e:
+        if e.status.code != 404:
+            raise
+        config_map = ConfigMap(
+            data={"labels": "{}"},
+            metadata=ObjectMeta(name=label_configmap_name, namespace=namespace),
+        )
+        client.create(config_map)
+        writes += 1
+    stored_labels = json.loads((config_map.data or {}).get("labels", "{}"))
+
+    # Labels that were previously set but are not desired anymore are set to None to delete them
+    patch_labels: Dict[str, Optional[str]] = {label: None for label in stored_labels}
+    patch_labels.update(labels)
+
+    stateful_set = client.get(StatefulSet, app_name, namespace=namespace)
+    template_labels = stateful_set.spec.template.metadata.labels  # type: ignore[union-attr]
+    stateful_set_patch = get_labels_patch(template_labels, patch_labels)
+    if stateful_set_patch:
+        client.patch(
+            StatefulSet,
+            app_name,
+            {"spec": {"template": {"metadata": {"labels": stateful_set_patch}}}},
+            namespace=namespace,
+        )
+        writes += 1
+
+    service = client.get(Service, app_name, namespace=namespace)
+    service_patch = get_labels_patch(service.metadata.labels, patch_labels)  # type: ignore
+    if service_patch:
+        client.patch(
+            Service, app_name, {"metadata": {"labels": service_patch}}, namespace=namespace
+        )
+        writes += 1
+
+    # Store our actively managed labels so the next call knows which it might need to delete
+    if stored_labels != labels:
+        client.patch(
+            ConfigMap,
+            label_configmap_name,
+            {"data": {"labels": json.dumps(labels)}},
+            namespace=namespace,
+        )
+        writes += 1
+    return gets, writes
+
+
+def get_mesh_inputs_hash(
+    policies: list, related_apps: Dict[str, list], raw_cmr_data: Dict[str, str]
+) -> str:
+    """Returns a hash of everything the mesh policies built by the consumer depend on.
+
+    Args:
+        policies: the policies of the consumer, as dicts
+        related_apps: map of relation name to the names of the applications related over it
+        raw_cmr_data: map of application name to its serialized cross-model relation data
+    """
+    inputs = {"policies": policies, "related_apps": related_apps, "cmr_data": raw_cmr_data}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class MinimalPatchServiceMeshConsumer(ServiceMeshConsumer):
+    """ServiceMeshConsumer only writing the mesh labels and policies that changed.
+
+    ServiceMeshConsumer patches the charm's StatefulSet, Service and label ConfigMap every time it
+    sets the labels (eg: on every service-mesh relation-changed), even if they did not change.
+    This compares the desired labels with the stored and live ones first, see
+    reconcile_charm_labels.
+
+    It also rebuilds the mesh policies and rewrites them in the service-mesh relation every time
+    a relation they depend on is created or broken, which triggers another relation-changed on
+    the mesh side.  This stores a hash of the inputs of the policies, so they are only built
+    again when it changes, and only writes them if they differ from the ones in the databag.
+    The cross-model relation data is only validated again when it changes.
+
+    The lightkube client can be shared with the charm through lightkube_client_func, instead of
+    the library creating its own.
+    """
+
+    _stored = StoredState()
+
+    def __init__(
+        self,
+        *args,
+        lightkube_client_func: Optional[Callable[[], Client]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._lightkube_client_func = lightkube_client_func
+        self._stored.set_default(mesh_inputs_hash="", cmr_data={})
+
+    @property
+    def lightkube_client(self) -> Client:
+        """Returns the client from lightkube_client_func if given, else the library's own."""
+        if self._lightkube_client_func is not None:
+            return self._lightkube_client_func()
+        return super().lightkube_client
+
+    def update_service_mesh(self):
+        """Update the service mesh, if the policies changed.
+
+        Behaves like ServiceMeshConsumer.update_service_mesh, without building the policies if
+        their inputs did not change and without writing them if they did not change.
+        """
+        if self._relation is None:
+            return
+
+        raw_cmr_data = {
+            cmr.app.name: cmr.data[cmr.app]["cmr_data"]
+            for cmr in self._cmr_relations
+            if "cmr_data" in cmr.data[cmr.app]
+        }
+        related_apps = {
+            policy.relation: [
+                relation.app.name for relation in self._charm.model.relations[policy.relation]
+            ]
+            for policy in self._policies
+        }
+        inputs_hash = get_mesh_inputs_hash(
+            [policy.model_dump(mode="json") for policy in self._policies],
+            related_apps,
+            raw_cmr_data,
+        )
+        databag = self._relation.data[self._charm.app]
+        if inputs_hash == self._stored.mesh_inputs_hash and "policies" in databag:
+            logger.debug("Service mesh policies inputs unchanged, not updating the policies")
+            return
+
+        logger.debug("Updating service mesh policies.")
+        mesh_policies = build_mesh_policies(
+            relation_mapping=self._charm.model.relations,
+            target_app_name=self._charm.app.name,
+            target_namespace=self._my_namespace(),
+            policies=self._policies,
+            cmr_application_data=self._get_cmr_application_data(raw_cmr_data),
+        )
+        policies = json.dumps(mesh_policies)
+        if databag.get("policies") != policies:
+            databag["policies"] = policies
+        else:
+            logger.debug("Service mesh policies unchanged, not writing them")
+        self._stored.mesh_inputs_hash = inputs_hash
+
+    def _get_cmr_application_data(self, raw_cmr_data: Dict[str, str]) -> Dict[str, CMRData]:
+        """Returns the CMRData of each application, only validating the data that changed."""
+        cache = self._stored.cmr_data
+        for app_name in set(cache.keys()) - set(raw_cmr_data.keys()):
+            del cache[app_name]
+
+        cmr_application_data = {}
+        for app_name, raw_data in raw_cmr_data.items():
+            cached = cache.get(app_name)
+            if cached and cached["raw"] == raw_data:
+                cmr_application_data[app_name] = CMRData.model_construct(**cached["data"])
+                continue
+            data = CMRData.model_validate(json.loads(raw_data))
+            cache[app_name] = {"raw": raw_data, "data": data.model_dump()}
+            cmr_application_data[app_name] = data
+        return cmr_application_data
+
+    def _set_labels(self, labels: dict) -> None:
+        """Sets the labels on the charm's Pods (via StatefulSet) and Service, if they differ."""
+        gets, writes = reconcile_charm_labels(
+            client=self.lightkube_client,
+            app_name=self._charm.app.name,
+            namespace=self._charm.model.name,
+            label_configmap_name=self._label_configmap_name,
+            labels=labels,
+        )
+        logger.debug(
+            f"Reconciled the mesh labels with {gets} GET and {writes} PATCH/create requests"
+        )
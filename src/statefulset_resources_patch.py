@@ -0,0 +1,227 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Patches the resources of a workload container in the StatefulSet created by Juju."""
+import json
+import logging
+from typing import TYPE_CHECKING, Callable, List, Optional, Union
+
+from lightkube import ApiError
+from lightkube.core import exceptions
+from lightkube.models.core_v1 import ResourceRequirements
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.types import PatchType
+from lightkube.utils.quantity import equals_canonically, parse_quantity
+from ops.charm import CharmBase
+from ops.framework import BoundEvent, Object, StoredState
+
+if TYPE_CHECKING:
+    from lightkube import Client
+
+logger = logging.getLogger(__name__)
+
+# Map of (resource requirements field, resource) to the config option setting it
+RESOURCES_CONFIG_NAMES = {
+    ("requests", "cpu"): "cpu-request",
+    ("limits", "cpu"): "cpu-limit",
+    ("requests", "memory"): "memory-request",
+    ("limits", "memory"): "memory-limit",
+}
+
+
+def get_resource_requirements(config) -> ResourceRequirements:
+    """Returns the container resource requirements set in config.
+
+    Options left empty are not part of the requirements, so the Kubernetes defaults apply.
+
+    Raises:
+        ValueError: if a value is not a positive Kubernetes quantity, or if a request is greater
+                    than its limit.
+    """
+    requirements = {"requests": {}, "limits": {}}
+    for (field, resource), config_name in RESOURCES_CONFIG_NAMES.items():
+        value = str(config[config_name]).strip()
+        if not value:
+            continue
+        try:
+            quantity = parse_quantity(value)
+        except ValueError as e:
+            raise ValueError(f"{config_name} '{value}' is not a valid quantity") from e
+        if quantity <= 0:
+            raise ValueError(f"{config_name} '{value}' must be greater than 0")
+        requirements[field][resource] = value
+
+    for resource in ("cpu", "memory"):
+        request = requirements["requests"].get(resource)
+        limit = requirements["limits"].get(resource)
+        if request and limit and parse_quantity(request) > parse_quantity(limit):
+            raise ValueError(f"{resource} request '{request}' is greater than its limit '{limit}'")
+    return ResourceRequirements(**requirements)
+
+
+def format_resource_requirements(resource_reqs: ResourceRequirements) -> str:
+    """Returns a short description of resource_reqs, eg: `cpu: 100m/1, memory: -/1Gi`."""
+    requests = resource_reqs.requests or {}
+    limits = resource_reqs.limits or {}
+    return ", ".join(
+        f"{resource}: {requests.get(resource, '-')}/{limits.get(resource, '-')}"
+        for resource in ("cpu", "memory")
+        if resource in requests or resource in limits
+    )
+
+
+def _serialize(resource_reqs: ResourceRequirements) -> str:
+    """Returns resource_reqs as a string that can be stored and compared."""
+    return json.dumps(resource_reqs.to_dict(), sort_keys=True)
+
+
+class _PatchFailed(Exception):
+    """Raised when the container resources could not be patched."""
+
+
+class StatefulSetResourcesPatch(Object):
+    """A utility for patching the resources of a container in the StatefulSet set up by Juju.
+
+    The StatefulSet is only patched when the resources of the container differ from the desired
+    ones, as any change to its pod template rolls out new pods.  The outcome of the last patch is
+    stored, so the charm only reports the resources once they are applied, see is_applied and
+    failure.
+    """
+
+    _stored = StoredState()
+
+    def __init__(
+        self,
+        charm: CharmBase,
+        container_name: str,
+        resource_reqs_func: Callable[[], ResourceRequirements],
+        lightkube_client_func: Callable[[], "Client"],
+        *,
+        refresh_event: Optional[Union[BoundEvent, List[BoundEvent]]] = None,
+    ):
+        """Constructor for StatefulSetResourcesPatch.
+
+        Args:
+            charm: the charm that is instantiating the library.
+            container_name: name of the container to patch, as named in the charm metadata.
+            resource_reqs_func: returns the desired resource requirements of the container.
+                May raise ValueError if they are invalid, in which case nothing is patched.
+            lightkube_client_func: returns the lightkube client used to patch the StatefulSet.
+            refresh_event: an optional bound event or list of bound events which
+                will be observed to re-apply the patch (e.g. on config change).
+                The `install` and `upgrade-charm` events would be observed regardless.
+        """
+        super().__init__(charm, "statefulset-resources-patch")
+        self.charm = charm
+        self.container_name = container_name
+        self.resource_reqs_func = resource_reqs_func
+        self.lightkube_client_func = lightkube_client_func
+        self._stored.set_default(applied="", failure="")
+
+        self.framework.observe(charm.on.install, self._patch)
+        # Juju may reset the StatefulSet when upgrading the charm
+        self.framework.observe(charm.on.upgrade_charm, self._patch)
+
+        if refresh_event:
+            if not isinstance(refresh_event, list):
+                refresh_event = [refresh_event]
+
+            for evt in refresh_event:
+                self.framework.observe(evt, self._patch)
+
+    @property
+    def failure(self) -> str:
+        """Why the last patch failed, empty if it did not."""
+        return self._stored.failure
+
+    def is_applied(self, resource_reqs: ResourceRequirements) -> bool:
+        """Returns whether the last patch applied resource_reqs to the container."""
+        return not self.failure and self._stored.applied == _serialize(resource_reqs)
+
+    def _patch(self, _) -> None:
+        """Patch the resources of the container if they differ from the desired ones."""
+        try:
+            resource_reqs = self.resource_reqs_func()
+        except ValueError as e:
+            logger.error("Not patching the container resources, invalid resources: %s", e)
+            return
+
+        try:
+            self._apply(resource_reqs)
+        except _PatchFailed as e:
+            logger.error("Kubernetes StatefulSet patch failed: %s", e)
+            self._stored.failure = str(e)
+            self._stored.applied = ""
+        else:
+            self._stored.failure = ""
+            self._stored.applied = _serialize(resource_reqs)
+
+    def _apply(self, resource_reqs: ResourceRequirements) -> None:
+        """Patches the StatefulSet if the container resources differ from resource_reqs.
+
+        Raises:
+            _PatchFailed: if the resources could not be read or patched.
+        """
+        try:
+            client = self.lightkube_client_func()
+        except exceptions.ConfigError as e:
+            raise _PatchFailed(f"cannot create the k8s client: {e}") from e
+
+        try:
+            current_reqs = self._get_container_resources(client)
+            if current_reqs is None:
+                raise _PatchFailed(
+                    f"container '{self.container_name}' not found in the StatefulSet"
+                )
+            if equals_canonically(current_reqs, resource_reqs):
+                logger.debug("Container resources unchanged, not patching the StatefulSet")
+                return
+            client.patch(
+                StatefulSet,
+                self._app,
+                self._patch_body(resource_reqs),
+                namespace=self._namespace,
+                patch_type=PatchType.STRATEGIC,
+            )
+        except ApiError as e:
+            if e.status.code == 403:
+                raise _PatchFailed("`juju trust` this application") from e
+            raise _PatchFailed(str(e)) from e
+        logger.info("Kubernetes StatefulSet '%s' resources patched successfully", self._app)
+
+    def _patch_body(self, resource_reqs: ResourceRequirements) -> dict:
+        """Returns the strategic merge patch setting the resources of the container.
+
+        Resources that are not desired are set to None, which removes them from the container.
+        """
+        resources = {
+            field: {
+                resource: (getattr(resource_reqs, field) or {}).get(resource)
+                for resource in ("cpu", "memory")
+            }
+            for field in ("requests", "limits")
+        }
+        return {
+            "spec": {
+                "template": {
+                    "spec": {"containers": [{"name": self.container_name, "resources": resources}]}
+                }
+            }
+        }
+
+    def _get_container_resources(self, client: "Client") -> Optional[ResourceRequirements]:
+        """Returns the resources of the container in the StatefulSet, None if it is not there."""
+        statefulset = client.get(StatefulSet, name=self._app, namespace=self._namespace)
+        for container in statefulset.spec.template.spec.containers:  # type: ignore[union-attr]
+            if container.name == self.container_name:
+                return container.resources or ResourceRequirements()
+        return None
+
+    @property
+    def _app(self) -> str:
+        """Name of the current Juju application, which names the StatefulSet."""
+        return self.charm.app.name
+
+    @property
+    def _namespace(self) -> str:
+        """The Kubernetes namespace we're running in, named after the Juju model."""
+        return self.charm.model.name
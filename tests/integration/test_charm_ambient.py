@@ -1,16 +1,20 @@
 # Copyright 2023 Canonical Ltd. See LICENSE file for licensing details.
+import asyncio
 import json
 import logging
+import re
 import shutil
 from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, List
 
+import aiohttp
 import pytest
 import pytest_asyncio
 import yaml
 from charmed_kubeflow_chisme.testing import (
     GRAFANA_AGENT_APP,
+    ISTIO_INGRESS_K8S_APP,
     assert_grafana_dashboards,
     assert_logging,
     assert_metrics_endpoint,
@@ -26,7 +30,7 @@ from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
 from charms_dependencies import KUBEFLOW_PROFILES
 from dashboard_links_requirer_tester_charm.src.charm import generate_links_for_location
 from lightkube import Client
-from lightkube.resources.core_v1 import ConfigMap
+from lightkube.resources.core_v1 import ConfigMap, Service
 from pytest_operator.plugin import OpsTest
 
 from charm import ADDITIONAL_LINKS_CONFIG_NAME, EXTERNAL_LINKS_ORDER_CONFIG_NAME
@@ -51,6 +55,7 @@ HEADERS = {
     "kubeflow-userid": "test",
 }
 HTTP_PATH = "/volumes/"
+ASSETS_CACHE_MAX_AGE = 31536000
 KUBEFLOW_PROFILES_RELATION_NAME = "kubeflow-profiles"
 
 log = logging.getLogger(__name__)
@@ -378,6 +383,55 @@ async def test_ui_is_accessible(ops_test: OpsTest):
     )
 
 
+async def get_through_ingress(lightkube_client: Client, namespace: str, http_path: str):
+    """Sends a GET request for http_path to the ingress gateway.
+
+    Returns:
+        The status, headers and text of the response.
+    """
+    gateway_service = lightkube_client.get(
+        Service, f"{ISTIO_INGRESS_K8S_APP}-istio", namespace=namespace
+    )
+    url = f"http://{gateway_service.status.loadBalancer.ingress[0].ip}{http_path}"
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers={**HEADERS, "Accept-Encoding": "gzip"}) as response:
+            return response.status, response.headers, await response.text()
+
+
+async def test_gateway_compression_and_assets_cache(ops_test: OpsTest, lightkube_client: Client):
+    """Verify that the ingress gateway compresses the responses and lets browsers cache assets."""
+    app = ops_test.model.applications[CHARM_NAME]
+    await app.set_config(
+        {"compression": "true", "assets-cache-max-age": str(ASSETS_CACHE_MAX_AGE)}
+    )
+    try:
+        await ops_test.model.wait_for_idle([CHARM_NAME], status="active", timeout=300)
+
+        # The EnvoyFilter takes a few seconds to be pushed to the gateway
+        for _ in range(12):
+            status, headers, text = await get_through_ingress(
+                lightkube_client, ops_test.model_name, "/"
+            )
+            if headers.get("Content-Encoding") == "gzip":
+                break
+            await asyncio.sleep(5)
+        assert status == 200
+        assert headers.get("Content-Encoding") == "gzip"
+
+        asset_path = re.search(r'"(/assets/[^"?]+)', text)
+        assert asset_path, "No /assets/ path found in the dashboard page"
+        status, headers, _ = await get_through_ingress(
+            lightkube_client, ops_test.model_name, asset_path.group(1)
+        )
+        assert status == 200
+        assert headers.get("Cache-Control") == f"public, max-age={ASSETS_CACHE_MAX_AGE}, immutable"
+    finally:
+        # The gateway filters apply to everything the gateway serves, so they are not left on for
+        # the following tests
+        await app.reset_config(["compression", "assets-cache-max-age"])
+        await ops_test.model.wait_for_idle([CHARM_NAME], status="active", timeout=300)
+
+
 async def test_metrics_enpoint(ops_test: OpsTest):
     """Test metrics_endpoints are defined in relation data bag and their accessibility.
     This function gets all the metrics_endpoints from the relation data bag, checks if
@@ -0,0 +1,23 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+import pytest
+from ops.testing import Harness
+
+from charm import KubeflowDashboardOperator
+
+
+@pytest.fixture
+def unstarted_leader_harness() -> Harness:
+    """Returns a leader Harness, to be started by the test or fixture using it."""
+    harness = Harness(KubeflowDashboardOperator)
+    harness.set_model_name("a-model")
+    harness.set_leader(True)
+    yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def leader_harness(unstarted_leader_harness: Harness) -> Harness:
+    """Returns a started leader Harness."""
+    unstarted_leader_harness.begin()
+    return unstarted_leader_harness
@@ -0,0 +1,29 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Per-hook wall-clock benchmarks of the charm, run with pytest-benchmark and the ops Harness."""
+import pytest
+from ops.testing import Harness
+
+from charm import KubeflowDashboardOperator
+
+N_ROUNDS = 30
+
+
+def run_hook(leader: bool, event_name: str):
+    """Benchmarks creating the charm and emitting event_name, as done by a dispatch."""
+    harness = Harness(KubeflowDashboardOperator)
+    harness.set_model_name("a-model")
+    harness.set_leader(leader)
+    try:
+        harness.begin()
+        getattr(harness.charm.on, event_name).emit()
+    finally:
+        harness.cleanup()
+
+
+@pytest.mark.parametrize("event_name", ["update_status", "config_changed"])
+@pytest.mark.parametrize("leader", [False, True], ids=["follower", "leader"])
+def test_benchmark_hook(benchmark, leader: bool, event_name: str):
+    """Benchmarks the wall-clock time of a hook on the leader and on a follower."""
+    benchmark.group = event_name
+    benchmark.pedantic(run_hook, args=(leader, event_name), rounds=N_ROUNDS)
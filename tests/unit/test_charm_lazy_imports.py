@@ -0,0 +1,92 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Checks the charm entry point starts quickly and does not import heavy modules eagerly.
+
+Each check runs in a new interpreter, as every hook does.
+"""
+import json
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Generous budget for a cold start, around ten times what it takes on a developer machine, so only
+# a regression (eg: a heavy import at module level) and not a slow CI runner makes it fail
+COLD_START_BUDGET_SECONDS = 2.0
+N_RUNS = 3
+# Every hook imports the charm module in a new process, so modules imported at the top of it are
+# paid by every dispatch, including no-op hooks such as update-status on a non-leader unit.
+# These must only be imported by the code paths that use them.
+LAZY_MODULES = [
+    "charmed_kubeflow_chisme",
+    "charms.istio_beacon_k8s.v0.service_mesh",
+    "charms.istio_ingress_k8s.v0.istio_ingress_route",
+    "dashboard_configmap",
+    "jinja2",
+    "lightkube",
+    "pydantic",
+    "serialized_data_interface",
+    "service_mesh_consumer",
+    "statefulset_resources_patch",
+]
+IMPORT_CHARM_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import charm
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+# Runs update-status on a non-leader unit, timing everything but importing the ops Harness
+NON_LEADER_UPDATE_STATUS_SCRIPT = """
+import json, sys, time
+from ops.testing import Harness
+start = time.perf_counter()
+import charm
+harness = Harness(charm.KubeflowDashboardOperator)
+harness.begin()
+harness.charm.on.update_status.emit()
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_cold(script: str) -> Tuple[float, List[str]]:
+    """Runs script N_RUNS times in a new interpreter.
+
+    Returns:
+        The fastest of the durations printed by script and the modules it printed as loaded.
+    """
+    measurements = []
+    for _ in range(N_RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        measurements.append(json.loads(result.stdout.splitlines()[-1]))
+    return min(m["seconds"] for m in measurements), measurements[0]["modules"]
+
+
+def get_eagerly_loaded_modules(loaded_modules: List[str]) -> List[str]:
+    """Returns the LAZY_MODULES found in loaded_modules."""
+    return [
+        lazy_module
+        for lazy_module in LAZY_MODULES
+        if any(
+            module == lazy_module or module.startswith(f"{lazy_module}.")
+            for module in loaded_modules
+        )
+    ]
+
+
+def test_charm_cold_import():
+    seconds, loaded_modules = run_cold(IMPORT_CHARM_SCRIPT)
+
+    assert get_eagerly_loaded_modules(loaded_modules) == []
+    assert seconds < COLD_START_BUDGET_SECONDS, f"Cold import of the charm took {seconds:.3f}s"
+
+
+def test_non_leader_update_status_cold_start():
+    seconds, loaded_modules = run_cold(NON_LEADER_UPDATE_STATUS_SCRIPT)
+
+    assert get_eagerly_loaded_modules(loaded_modules) == []
+    assert (
+        seconds < COLD_START_BUDGET_SECONDS
+    ), f"Cold update-status on a non-leader took {seconds:.3f}s"
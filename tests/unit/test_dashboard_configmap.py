@@ -0,0 +1,120 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
+    DashboardLink,
+    dashboard_links_to_json,
+)
+
+from dashboard_configmap import (
+    DASHBOARD_SETTINGS,
+    MAX_CONFIGMAP_SIZE_BYTES,
+    ConfigMapTooLargeError,
+    DashboardConfigMapHandler,
+    check_payload_size,
+    get_payload_size,
+    render_configmap_data,
+)
+
+
+def build_context(n_menu_links: int = 2) -> dict:
+    """Returns a charm context with n_menu_links menu links and one documentation link."""
+    menu_links = [
+        DashboardLink(text=f"text{i}", link=f"/link{i}", location="menu")
+        for i in range(n_menu_links)
+    ]
+    documentation_links = [
+        DashboardLink(text="docs", link="https://docs", location="documentation")
+    ]
+    return {
+        "namespace": "a-model",
+        "configmap_name": "centraldashboard-config",
+        "menuLinks": dashboard_links_to_json(menu_links),
+        "externalLinks": dashboard_links_to_json([]),
+        "quickLinks": dashboard_links_to_json([]),
+        "documentationItems": dashboard_links_to_json(documentation_links),
+    }
+
+
+def test_render_configmap_data():
+    context = build_context()
+
+    data = render_configmap_data(context)
+
+    assert data["settings"] == DASHBOARD_SETTINGS
+    assert json.loads(data["links"]) == {
+        "menuLinks": json.loads(context["menuLinks"]),
+        "externalLinks": [],
+        "quickLinks": [],
+        "documentationItems": json.loads(context["documentationItems"]),
+    }
+
+
+def test_get_payload_size():
+    assert get_payload_size({"links": "{}", "é": "é"}) == len("links") + 2 + 2 + 2
+
+
+def test_check_payload_size_too_large():
+    # Each link is a little over 100 bytes, so 10k links exceed 1 MiB
+    data = render_configmap_data(build_context(n_menu_links=10_000))
+    assert get_payload_size(data) > MAX_CONFIGMAP_SIZE_BYTES
+
+    with pytest.raises(ConfigMapTooLargeError) as err:
+        check_payload_size(data)
+    assert err.value.size == get_payload_size(data)
+
+
+def test_handler_render_manifests():
+    handler = DashboardConfigMapHandler(
+        field_manager="lightkube", context=build_context(), lightkube_client=MagicMock()
+    )
+
+    manifests = handler.render_manifests()
+
+    assert len(manifests) == 1
+    assert manifests[0].metadata.name == "centraldashboard-config"
+    assert manifests[0].metadata.namespace == "a-model"
+    assert manifests[0].data == render_configmap_data(build_context())
+
+
+def test_handler_render_manifests_with_rendered_data():
+    data = {"links": "{}", "settings": DASHBOARD_SETTINGS}
+    handler = DashboardConfigMapHandler(
+        field_manager="lightkube", context=build_context(), lightkube_client=MagicMock(), data=data
+    )
+
+    with patch("dashboard_configmap.render_configmap_data") as render_configmap_data:
+        manifests = handler.render_manifests()
+
+    render_configmap_data.assert_not_called()
+    assert manifests[0].data == data
+
+
+@patch("dashboard_configmap.apply_many")
+def test_handler_apply(apply_many: MagicMock):
+    lightkube_client = MagicMock()
+    handler = DashboardConfigMapHandler(
+        field_manager="lightkube", context=build_context(), lightkube_client=lightkube_client
+    )
+
+    handler.apply()
+
+    apply_many.assert_called_once()
+    assert apply_many.call_args.kwargs["client"] == lightkube_client
+    assert apply_many.call_args.kwargs["objs"] == handler.render_manifests()
+
+
+@patch("dashboard_configmap.apply_many")
+def test_handler_apply_too_large(apply_many: MagicMock):
+    handler = DashboardConfigMapHandler(
+        field_manager="lightkube",
+        context=build_context(n_menu_links=10_000),
+        lightkube_client=MagicMock(),
+    )
+
+    with pytest.raises(ConfigMapTooLargeError):
+        handler.apply()
+    apply_many.assert_not_called()
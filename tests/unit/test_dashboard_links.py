@@ -6,8 +6,12 @@ import yaml
 from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import DashboardLink
 
 from dashboard_links import (
+    CONFIG_LOADER_JSON,
+    CONFIG_LOADER_LIBYAML,
+    CONFIG_LOADER_YAML,
     aggregate_links,
     aggregate_links_as_json,
+    load_config_value,
     parse_dashboard_link_config,
     sort_dashboard_links,
 )
@@ -420,3 +424,24 @@ def test_aggregate_links_as_json(dashboard_links, location, expected_json):
     expected = json.loads(expected_json)
 
     assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "config, expected_value, expected_loaders",
+    [
+        ('["a", "b"]', ["a", "b"], {CONFIG_LOADER_JSON}),
+        ('[{"text": "1"}]', [{"text": "1"}], {CONFIG_LOADER_JSON}),
+        ("- a\n- b\n", ["a", "b"], {CONFIG_LOADER_LIBYAML, CONFIG_LOADER_YAML}),
+        ("", None, {CONFIG_LOADER_LIBYAML, CONFIG_LOADER_YAML}),
+    ],
+)
+def test_load_config_value(config, expected_value, expected_loaders):
+    actual_value, actual_loader = load_config_value(config)
+
+    assert actual_value == expected_value
+    assert actual_loader in expected_loaders
+
+
+def test_load_config_value_invalid():
+    with pytest.raises(yaml.YAMLError):
+        load_config_value("[malformed yaml")
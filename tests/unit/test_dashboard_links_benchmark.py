@@ -0,0 +1,120 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Benchmarks for the dashboard links tooling, run with pytest-benchmark."""
+import json
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pytest
+import yaml
+from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
+    DashboardLink,
+    dashboard_links_to_json,
+)
+
+from dashboard_links import CONFIG_LOADER_JSON, load_config_value, sort_dashboard_links
+
+CONFIG = yaml.safe_load(Path("./config.yaml").read_text())
+DEFAULT_DOCUMENTATION_LINKS = CONFIG["options"]["additional-documentation-links"]["default"]
+N_LINKS = 50_000
+
+
+@dataclass
+class DictDashboardLink:
+    """DashboardLink as implemented before it was slotted, used as a reference."""
+
+    text: str
+    link: str
+    location: str
+    icon: str = "icons:link"
+    type: str = "item"  # noqa: A003
+    desc: str = ""
+
+
+def build_links(link_class) -> list:
+    """Returns N_LINKS links of link_class, with runtime-built location, icon and type strings."""
+    return [
+        link_class(
+            text=f"text{i}",
+            link=f"/link{i}",
+            location="".join("menu"),
+            icon="".join("icons:link"),
+            type="".join("item"),
+        )
+        for i in range(N_LINKS)
+    ]
+
+
+def measure_allocated_bytes(func) -> int:
+    """Returns the memory still allocated by the result of func()."""
+    tracemalloc.start()
+    result = func()  # noqa: F841
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated_bytes
+
+
+def test_benchmark_sort_dashboard_links(benchmark):
+    """Benchmarks sort_dashboard_links with 10k links and 1k preferred entries."""
+    # Arrange
+    # Every 10th link is preferred, and the preferred order is the reverse of the input order
+    dashboard_links = [
+        DashboardLink(text=f"text{i:05d}", link=f"/link{i}", location="menu")
+        for i in range(10_000)
+    ]
+    preferred_link_order = [f"text{i:05d}" for i in reversed(range(0, 10_000, 10))]
+
+    # Act
+    actual_sorted_links = benchmark(
+        sort_dashboard_links, dashboard_links, preferred_link_order=preferred_link_order
+    )
+
+    # Assert
+    assert len(actual_sorted_links) == len(dashboard_links)
+    assert [link.text for link in actual_sorted_links[:1_000]] == preferred_link_order
+    remaining_texts = [link.text for link in actual_sorted_links[1_000:]]
+    assert remaining_texts == sorted(remaining_texts)
+
+
+@pytest.mark.benchmark(group="load-default-documentation-links")
+def test_benchmark_load_config_value(benchmark):
+    """Benchmarks the tiered config loader on the default additional-documentation-links."""
+    value, loader_name = benchmark(load_config_value, DEFAULT_DOCUMENTATION_LINKS)
+
+    assert loader_name == CONFIG_LOADER_JSON
+    assert value == yaml.safe_load(DEFAULT_DOCUMENTATION_LINKS)
+
+
+@pytest.mark.benchmark(group="load-default-documentation-links")
+def test_benchmark_yaml_safe_load(benchmark):
+    """Benchmarks yaml.safe_load on the default additional-documentation-links, for reference."""
+    benchmark(yaml.safe_load, DEFAULT_DOCUMENTATION_LINKS)
+
+
+def test_dashboard_links_memory():
+    """Compares the memory used by 50k slotted DashboardLinks against the dict-based reference."""
+    slotted_bytes = measure_allocated_bytes(lambda: build_links(DashboardLink))
+    reference_bytes = measure_allocated_bytes(lambda: build_links(DictDashboardLink))
+
+    assert (
+        slotted_bytes < reference_bytes
+    ), f"{N_LINKS} links: {slotted_bytes} bytes slotted, {reference_bytes} bytes reference"
+
+
+@pytest.mark.benchmark(group="serialize-50k-links")
+def test_benchmark_dashboard_links_to_json(benchmark):
+    """Benchmarks dashboard_links_to_json on 50k DashboardLinks."""
+    dashboard_links = build_links(DashboardLink)
+
+    actual_json = benchmark(dashboard_links_to_json, dashboard_links)
+
+    assert actual_json == json.dumps([asdict(link) for link in dashboard_links])
+
+
+@pytest.mark.benchmark(group="serialize-50k-links")
+def test_benchmark_asdict_to_json(benchmark):
+    """Benchmarks serializing 50k links through dataclasses.asdict, for reference."""
+    dashboard_links = build_links(DictDashboardLink)
+
+    benchmark(lambda: json.dumps([asdict(link) for link in dashboard_links]))
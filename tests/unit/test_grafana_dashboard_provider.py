@@ -0,0 +1,136 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from charms.grafana_k8s.v0.grafana_dashboard import CharmedDashboard, GrafanaDashboardProvider
+from ops.testing import Harness
+
+from grafana_dashboard_provider import get_dashboard_files_index
+
+DASHBOARDS_PATH = Path("./src/grafana_dashboards")
+RELATION_NAME = "grafana-dashboard"
+
+
+@pytest.fixture
+def dashboards_path(tmp_path: Path) -> Path:
+    """Returns a copy of the charm's dashboards directory."""
+    path = tmp_path / "grafana_dashboards"
+    shutil.copytree(DASHBOARDS_PATH, path)
+    return path
+
+
+@pytest.fixture
+def harness(leader_harness: Harness, dashboards_path: Path) -> Harness:
+    """Returns a started leader Harness whose dashboard provider reads from dashboards_path."""
+    # Dashboard uids are derived from their path relative to the charm directory
+    leader_harness.framework.charm_dir = dashboards_path.parent
+    leader_harness.charm.dashboard_provider._dashboards_path = str(dashboards_path)
+    return leader_harness
+
+
+def get_sent_dashboards(harness: Harness, rel_id: int) -> dict:
+    """Returns the dashboards sent over a grafana-dashboard relation."""
+    return json.loads(harness.get_relation_data(rel_id, harness.charm.app.name)["dashboards"])
+
+
+def test_get_dashboard_files_index(dashboards_path: Path):
+    """Tests the index covers the dashboard files and what their encoding depends on."""
+    (dashboards_path / "README.md").write_text("not a dashboard")
+    topology = {"model": "a-model", "unit": "app/0"}
+
+    index = get_dashboard_files_index(dashboards_path, True, topology)
+
+    assert sorted(index.keys()) == sorted(path.name for path in DASHBOARDS_PATH.glob("*"))
+    assert index == get_dashboard_files_index(dashboards_path, True, topology)
+    assert index != get_dashboard_files_index(dashboards_path, False, topology)
+    assert index != get_dashboard_files_index(dashboards_path, True, {"unit": "app/1"})
+
+
+def test_unchanged_dashboards_are_not_encoded_or_sent_again(harness: Harness):
+    rel_id = harness.add_relation(RELATION_NAME, "grafana")
+    sent_dashboards = get_sent_dashboards(harness, rel_id)
+    assert len(sent_dashboards["templates"]) == len(list(DASHBOARDS_PATH.glob("*")))
+
+    with patch.object(
+        CharmedDashboard,
+        "load_dashboards_from_dir",
+        wraps=CharmedDashboard.load_dashboards_from_dir,
+    ) as load_dashboards_from_dir:
+        harness.charm.on.config_changed.emit()
+        harness.charm.on.upgrade_charm.emit()
+
+    load_dashboards_from_dir.assert_not_called()
+    # The relation data holds a random uuid, which is only renewed when it is written
+    assert get_sent_dashboards(harness, rel_id) == sent_dashboards
+
+
+def test_changed_dashboard_is_encoded_and_sent_again(harness: Harness, dashboards_path: Path):
+    rel_id = harness.add_relation(RELATION_NAME, "grafana")
+    sent_templates = get_sent_dashboards(harness, rel_id)["templates"]
+    changed_path = dashboards_path / "generic.json.tmpl"
+    changed_dashboard = json.loads(changed_path.read_text())
+    changed_dashboard["title"] = "Changed"
+    changed_path.write_text(json.dumps(changed_dashboard))
+
+    with patch.object(
+        CharmedDashboard,
+        "load_dashboards_from_dir",
+        wraps=CharmedDashboard.load_dashboards_from_dir,
+    ) as load_dashboards_from_dir:
+        harness.charm.on.config_changed.emit()
+
+    # Only the changed file is loaded
+    path_filter = load_dashboards_from_dir.call_args.kwargs["path_filter"]
+    assert [path.name for path in dashboards_path.glob("*") if path_filter(path)] == [
+        changed_path.name
+    ]
+    actual_templates = get_sent_dashboards(harness, rel_id)["templates"]
+    assert actual_templates.keys() == sent_templates.keys()
+    changed_ids = [
+        dashboard_id
+        for dashboard_id in actual_templates
+        if actual_templates[dashboard_id] != sent_templates[dashboard_id]
+    ]
+    assert changed_ids == ["file:generic.json"]
+
+
+def test_removed_dashboard_is_dropped(harness: Harness, dashboards_path: Path):
+    rel_id = harness.add_relation(RELATION_NAME, "grafana")
+    (dashboards_path / "generic.json.tmpl").unlink()
+
+    harness.charm.on.config_changed.emit()
+
+    assert "file:generic.json" not in get_sent_dashboards(harness, rel_id)["templates"]
+    assert (
+        "generic.json.tmpl" not in harness.charm.dashboard_provider._stored.dashboard_files_index
+    )
+
+
+def test_new_relation_is_sent_dashboards(harness: Harness):
+    rel_id = harness.add_relation(RELATION_NAME, "grafana")
+    sent_dashboards = get_sent_dashboards(harness, rel_id)
+    other_rel_id = harness.add_relation(RELATION_NAME, "other-grafana")
+
+    # The existing relation is not written again
+    assert get_sent_dashboards(harness, rel_id) == sent_dashboards
+    assert get_sent_dashboards(harness, other_rel_id)["templates"] == sent_dashboards["templates"]
+
+
+def test_sends_the_same_dashboards_as_the_library(harness: Harness, dashboards_path: Path):
+    """Tests the incremental encoding matches a full scan by GrafanaDashboardProvider."""
+    rel_id = harness.add_relation(RELATION_NAME, "grafana")
+    changed_path = dashboards_path / "generic.json.tmpl"
+    changed_dashboard = json.loads(changed_path.read_text())
+    changed_dashboard["title"] = "Changed"
+    changed_path.write_text(json.dumps(changed_dashboard))
+    changed_path.rename(dashboards_path / "renamed.json.tmpl")
+    harness.charm.on.config_changed.emit()
+    sent_templates = get_sent_dashboards(harness, rel_id)["templates"]
+
+    GrafanaDashboardProvider._update_all_dashboards_from_dir(harness.charm.dashboard_provider)
+
+    assert get_sent_dashboards(harness, rel_id)["templates"] == sent_templates
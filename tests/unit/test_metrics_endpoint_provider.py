@@ -0,0 +1,197 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+import json
+import re
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from charms.prometheus_k8s.v0 import prometheus_scrape
+from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
+from cosl.rules import AlertRules, generic_alert_groups
+from ops.model import RelationDataContent
+from ops.testing import Harness
+
+import metrics_endpoint_provider
+from metrics_endpoint_provider import get_alert_rules_hash
+
+ALERT_RULES_PATH = Path("./src/prometheus_alert_rules")
+DASHBOARDS_PATH = Path("./src/grafana_dashboards")
+RELATION_NAME = "metrics-endpoint"
+TOPOLOGY = {"model": "a-model", "application": "kubeflow-dashboard"}
+# Recorded series follow the level:metric:operations naming convention
+RECORDED_SERIES_PATTERN = re.compile(r"\b[a-z_]+:[a-z0-9_]+:[a-z0-9_]+\b")
+
+
+@pytest.fixture
+def alert_rules_path(tmp_path: Path) -> Path:
+    """Returns a copy of the charm's alert rules directory."""
+    path = tmp_path / "prometheus_alert_rules"
+    shutil.copytree(ALERT_RULES_PATH, path)
+    return path
+
+
+@pytest.fixture
+def harness(leader_harness: Harness, alert_rules_path: Path) -> Harness:
+    """Returns a started leader Harness whose metrics provider reads from alert_rules_path."""
+    leader_harness.charm.prometheus_provider._alert_rules_path = str(alert_rules_path)
+    return leader_harness
+
+
+def test_get_alert_rules_hash(alert_rules_path: Path):
+    alert_rules_hash = get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+
+    assert alert_rules_hash == get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+    assert alert_rules_hash != get_alert_rules_hash(str(alert_rules_path), {"model": "other"})
+    (alert_rules_path / "new.rules").write_text("groups: []")
+    assert alert_rules_hash != get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+
+
+def test_get_alert_rules_hash_covers_library_versions(alert_rules_path: Path):
+    """Tests the stored alert rules are loaded again when the charm ships other libraries."""
+    alert_rules_hash = get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+
+    with patch.object(prometheus_scrape, "LIBPATCH", prometheus_scrape.LIBPATCH + 1):
+        assert alert_rules_hash != get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+    with patch("importlib.metadata.version", return_value="0.0.0"):
+        assert alert_rules_hash != get_alert_rules_hash(str(alert_rules_path), TOPOLOGY)
+
+
+def test_get_alert_rules_hash_missing_directory(tmp_path: Path):
+    assert get_alert_rules_hash(str(tmp_path / "missing"), TOPOLOGY) == get_alert_rules_hash(
+        None, TOPOLOGY
+    )
+
+
+@pytest.mark.parametrize("forward_alert_rules", [True, False])
+def test_relation_data_matches_metrics_endpoint_provider(
+    harness: Harness, alert_rules_path: Path, forward_alert_rules: bool
+):
+    """Tests the relation data is the same as the one written by MetricsEndpointProvider."""
+    rel_id = harness.add_relation(RELATION_NAME, "prometheus")
+    provider = harness.charm.prometheus_provider
+    provider._forward_alert_rules = forward_alert_rules
+    provider.set_scrape_job_spec()
+    # Changed rules are loaded again
+    (alert_rules_path / "kubeflow_dashboard_requests.rules").unlink()
+    provider.set_scrape_job_spec()
+    app_data = dict(harness.get_relation_data(rel_id, harness.charm.app.name))
+
+    MetricsEndpointProvider.set_scrape_job_spec(provider)
+
+    assert harness.get_relation_data(rel_id, harness.charm.app.name) == app_data
+
+
+def test_unchanged_alert_rules_are_not_loaded_or_written_again(harness: Harness):
+    harness.add_relation(RELATION_NAME, "prometheus")
+    harness.charm.prometheus_provider.set_scrape_job_spec()
+
+    with patch.object(
+        metrics_endpoint_provider, "AlertRules", wraps=AlertRules
+    ) as alert_rules, patch.object(
+        RelationDataContent,
+        "__setitem__",
+        autospec=True,
+        side_effect=RelationDataContent.__setitem__,
+    ) as relation_data_setitem:
+        harness.charm.prometheus_provider.set_scrape_job_spec()
+
+    alert_rules.assert_not_called()
+    written_keys = [call.args[1] for call in relation_data_setitem.call_args_list]
+    assert not {"alert_rules", "scrape_jobs", "scrape_metadata"} & set(written_keys)
+
+
+def test_changed_alert_rules_are_loaded_and_written(harness: Harness, alert_rules_path: Path):
+    rel_id = harness.add_relation(RELATION_NAME, "prometheus")
+    harness.charm.prometheus_provider.set_scrape_job_spec()
+    for path in alert_rules_path.glob("*"):
+        path.unlink()
+
+    harness.charm.prometheus_provider.set_scrape_job_spec()
+
+    alert_rules = json.loads(
+        harness.get_relation_data(rel_id, harness.charm.app.name)["alert_rules"]
+    )
+    # Only the generic application rules are left
+    assert len(alert_rules["groups"]) == len(generic_alert_groups.application_rules["groups"])
+
+
+@patch("subprocess.run")
+def test_observability_hooks_do_not_run_subprocesses(subprocess_run: MagicMock, harness: Harness):
+    """Tests that publishing dashboards and alert rules never forks (eg: cos-tool)."""
+    grafana_rel_id = harness.add_relation("grafana-dashboard", "grafana")
+    harness.add_network("10.0.0.10")
+    # MetricsEndpointProvider sends the alert rules when a unit joins
+    prometheus_rel_id = harness.add_relation(RELATION_NAME, "prometheus", unit_data={})
+
+    harness.charm.on.config_changed.emit()
+    harness.charm.on.upgrade_charm.emit()
+
+    subprocess_run.assert_not_called()
+    assert "dashboards" in harness.get_relation_data(grafana_rel_id, harness.charm.app.name)
+    assert "alert_rules" in harness.get_relation_data(prometheus_rel_id, harness.charm.app.name)
+
+
+def test_recorded_series_are_defined():
+    """Tests the series used by the alert rules and dashboards are the recorded ones."""
+    rules = [
+        rule
+        for path in ALERT_RULES_PATH.glob("*.rules")
+        for group in yaml.safe_load(path.read_text())["groups"]
+        for rule in group["rules"]
+    ]
+    recorded_series = {rule["record"] for rule in rules if "record" in rule}
+    queries = [rule["expr"] for rule in rules]
+    queries += [path.read_text() for path in DASHBOARDS_PATH.glob("*.tmpl")]
+
+    used_series = {
+        series for query in queries for series in RECORDED_SERIES_PATTERN.findall(query)
+    }
+
+    assert {
+        "juju_application:rest_http_request_duration_seconds:p95_rate2m",
+        "juju_application:rest_http_request_total:rate2m",
+        "juju_application:rest_http_request_errors:ratio_rate2m",
+        "juju_unit:rest_http_request_total:rate2m",
+        "juju_unit:rest_http_request_duration_seconds:p50_rate2m",
+        "juju_unit:rest_http_request_duration_seconds:p90_rate2m",
+        "juju_unit:rest_http_request_duration_seconds:p99_rate2m",
+    } <= recorded_series
+    # No series is recorded without being used
+    assert used_series == recorded_series
+
+
+def test_alerts_are_evaluated_per_application():
+    """Tests the request alerts use series aggregated over all the units of the application."""
+    alerts = [
+        rule
+        for group in yaml.safe_load(
+            (ALERT_RULES_PATH / "kubeflow_dashboard_requests.rules").read_text()
+        )["groups"]
+        for rule in group["rules"]
+    ]
+
+    assert alerts
+    for alert in alerts:
+        used_series = RECORDED_SERIES_PATTERN.findall(alert["expr"])
+        assert used_series
+        assert all(series.startswith("juju_application:") for series in used_series)
+
+
+def test_recording_rules_are_labelled_with_topology(harness: Harness):
+    """Tests the recording rules are sent with the charm's topology labels."""
+    rel_id = harness.add_relation(RELATION_NAME, "prometheus")
+    harness.charm.prometheus_provider.set_scrape_job_spec()
+
+    alert_rules = json.loads(
+        harness.get_relation_data(rel_id, harness.charm.app.name)["alert_rules"]
+    )
+    recording_rules = [
+        rule for group in alert_rules["groups"] for rule in group["rules"] if "record" in rule
+    ]
+    assert recording_rules
+    for rule in recording_rules:
+        assert rule["labels"]["juju_model"] == "a-model"
+        assert rule["labels"]["juju_application"] == harness.charm.app.name
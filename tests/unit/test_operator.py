@@ -9,20 +9,25 @@ from unittest.mock import MagicMock, patch
 import pytest
 import yaml
 from charmed_kubeflow_chisme.exceptions import GenericCharmRuntimeError
-from charms.istio_ingress_k8s.v0.istio_ingress_route import ProtocolType
+from charms.istio_ingress_k8s.v0.istio_ingress_route import IstioIngressRouteConfig, ProtocolType
 from charms.kubeflow_dashboard.v0.kubeflow_dashboard_links import (
     DASHBOARD_LINKS_FIELD,
     DashboardLink,
 )
 from lightkube import ApiError
-from ops.model import ActiveStatus, BlockedStatus, WaitingStatus
+from lightkube.models.autoscaling_v2 import HorizontalPodAutoscalerStatus
+from lightkube.resources.autoscaling_v2 import HorizontalPodAutoscaler
+from ops.model import ActiveStatus, BlockedStatus, MaintenanceStatus, OpenedPort, WaitingStatus
 from ops.pebble import ChangeError
 from ops.testing import Harness
 
+import dashboard_configmap
 from charm import (
     ADDITIONAL_LINKS_CONFIG_NAME,
+    AUTOSCALING_RESOURCE_FILES,
     DASHBOARD_LINKS_RELATION_NAME,
     EXTERNAL_LINKS_ORDER_CONFIG_NAME,
+    TRAFFIC_POLICY_RESOURCE_FILES,
     KubeflowDashboardOperator,
 )
 
@@ -38,11 +43,9 @@ RELATION_DATA = [
     }
 ]
 
-
 DEFAULT_RESOURCE_FILES = [
     "profile_crds.yaml.j2",
     "auth_manifests.yaml.j2",
-    "configmaps.yaml.j2",
 ]
 
 
@@ -79,6 +82,13 @@ class _FakeChangeError(ChangeError):
         super().__init__(err, change)
 
 
+@pytest.fixture(autouse=True)
+def statefulset_patch_apply():
+    """Makes the StatefulSet resources patch succeed without a Kubernetes API."""
+    with patch("statefulset_resources_patch.StatefulSetResourcesPatch._apply") as apply:
+        yield apply
+
+
 @pytest.fixture
 def harness() -> Harness:
     harness = Harness(KubeflowDashboardOperator)
@@ -104,26 +114,75 @@ def harness_with_profiles(harness: Harness) -> Harness:
 
 
 class TestCharm:
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     def test_log_forwarding(self, harness: Harness):
         with patch("charm.LogForwarder") as mock_logging:
             harness.begin()
             mock_logging.assert_called_once_with(charm=harness.charm)
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
-    def test_check_leader_failure(self, harness: Harness):
-        harness.begin_with_initial_hooks()
-        assert harness.charm.model.unit.status == WaitingStatus("Waiting for leadership")
+    @patch("charm.KubeflowDashboardOperator.configmap_handler")
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
+    @patch("charm.KubeflowDashboardOperator._update_layer")
+    def test_main_non_leader(
+        self,
+        update_layer: MagicMock,
+        k8s_resource_handler: MagicMock,
+        configmap_handler: MagicMock,
+        harness_with_profiles: Harness,
+    ):
+        """Tests that non-leaders run the workload without applying shared resources."""
+        harness_with_profiles.set_leader(False)
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.install.emit()
+
+        update_layer.assert_called_once()
+        k8s_resource_handler.apply.assert_not_called()
+        configmap_handler.apply.assert_not_called()
+        assert harness_with_profiles.charm.profiles_service == "service-name"
+        assert isinstance(harness_with_profiles.charm.model.unit.status, ActiveStatus)
+
+        # Becoming the leader changes the desired state, so the shared resources get applied
+        harness_with_profiles.set_leader(True)
+        k8s_resource_handler.apply.assert_called_once()
+        configmap_handler.apply.assert_called_once()
+
+    @patch("charm.IndexedGrafanaDashboardProvider")
+    def test_non_leader_skips_leader_only_libraries(
+        self,
+        grafana_dashboard_provider: MagicMock,
+        harness: Harness,
+    ):
+        """Tests that followers do not create the libraries managing application-level state."""
+        harness.set_leader(False)
+        harness.begin()
+
+        grafana_dashboard_provider.assert_not_called()
+        for attribute in ["dashboard_provider", "_mesh", "ingress"]:
+            assert not hasattr(harness.charm, attribute)
+
+    @patch("charm.IndexedGrafanaDashboardProvider")
+    def test_leader_creates_leader_only_libraries(
+        self,
+        grafana_dashboard_provider: MagicMock,
+        harness: Harness,
+    ):
         harness.set_leader(True)
-        assert harness.charm.model.unit.status != WaitingStatus("Waiting for leadership")
+        harness.begin()
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
-    def test_check_leader_success(self, harness: Harness):
+        grafana_dashboard_provider.assert_called_once_with(harness.charm)
+        assert harness.charm.dashboard_provider == grafana_dashboard_provider.return_value
+
+    def test_non_leader_runs_the_checks(self, harness: Harness):
+        """Tests that followers go through the same checks as the leader."""
+        harness.set_leader(False)
         harness.begin_with_initial_hooks()
-        harness.set_leader(True)
-        assert harness.charm.model.unit.status != WaitingStatus("Waiting for leadership")
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
+        assert harness.charm.model.unit.status == BlockedStatus(
+            "Add required relation to kubeflow-profiles"
+        )
+
     def test_check_kf_profiles_failure(self, harness: Harness):
         harness.set_leader(True)
         harness.begin_with_initial_hooks()
@@ -132,8 +191,7 @@ class TestCharm:
             "Add required relation to kubeflow-profiles"
         )
 
-    @patch("charm.KubernetesResourceHandler")
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
+    @patch("charmed_kubeflow_chisme.kubernetes.KubernetesResourceHandler")
     def test_check_kf_profiles_success(self, harness_with_profiles: Harness):
         harness_with_profiles.begin_with_initial_hooks()
 
@@ -143,7 +201,6 @@ class TestCharm:
 
     @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.container")
     def test_update_layer_failure(
         self,
@@ -155,7 +212,332 @@ class TestCharm:
         with pytest.raises(GenericCharmRuntimeError):
             harness_with_profiles.begin_with_initial_hooks()
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    def test_update_layer_nodejs_environment(self, harness_with_profiles: Harness):
+        harness_with_profiles.update_config(
+            {"nodejs-max-old-space-size": 512, "uv-threadpool-size": 8}
+        )
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        with patch.object(type(container), "replan", autospec=True) as replan:
+            harness_with_profiles.charm.on.config_changed.emit()
+            environment = container.get_plan().services[CHARM_NAME].environment
+            assert environment["NODE_OPTIONS"] == "--max-old-space-size=512"
+            assert environment["UV_THREADPOOL_SIZE"] == "8"
+            replan.assert_called_once()
+
+            # A change that does not affect the layer does not replan the workload
+            harness_with_profiles.update_config(
+                {ADDITIONAL_LINKS_CONFIG_NAME["menu"]: '[{"text": "1", "link": "/1"}]'}
+            )
+            replan.assert_called_once()
+
+            harness_with_profiles.update_config({"nodejs-max-old-space-size": 0})
+            environment = container.get_plan().services[CHARM_NAME].environment
+            assert environment["NODE_OPTIONS"] == ""
+            assert replan.call_count == 2
+        assert isinstance(harness_with_profiles.charm.model.unit.status, ActiveStatus)
+
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
+    def test_main_reports_container_resources(self, harness_with_profiles: Harness):
+        harness_with_profiles.update_config({"cpu-request": "100m", "memory-limit": "1Gi"})
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.config_changed.emit()
+        assert harness_with_profiles.charm.model.unit.status == ActiveStatus(
+            "cpu: 100m/-, memory: -/1Gi"
+        )
+
+        harness_with_profiles.update_config({"cpu-limit": "10m"})
+        assert harness_with_profiles.charm.model.unit.status == BlockedStatus(
+            "cpu request '100m' is greater than its limit '10m'"
+        )
+
+    def test_autoscaling_manifests(self, harness: Harness):
+        harness.update_config(
+            {
+                "autoscaling": True,
+                "autoscaling-min-replicas": 2,
+                "autoscaling-max-replicas": 5,
+                "autoscaling-target-cpu-utilization": 70,
+            }
+        )
+        harness.begin()
+        charm = harness.charm
+
+        manifests = charm._render_templates(AUTOSCALING_RESOURCE_FILES, charm._autoscaling_context)
+
+        hpa, pdb = yaml.safe_load_all(manifests[0])
+        assert hpa["kind"] == "HorizontalPodAutoscaler"
+        assert hpa["spec"]["scaleTargetRef"]["name"] == charm.app.name
+        assert (hpa["spec"]["minReplicas"], hpa["spec"]["maxReplicas"]) == (2, 5)
+        assert hpa["spec"]["metrics"][0]["resource"]["target"]["averageUtilization"] == 70
+        assert pdb["kind"] == "PodDisruptionBudget"
+        assert pdb["spec"]["minAvailable"] == 1
+        assert "maxUnavailable" not in pdb["spec"]
+
+        # A single pod is not protected, so that node drains are not blocked
+        harness.update_config({"autoscaling-min-replicas": 1})
+        manifests = charm._render_templates(AUTOSCALING_RESOURCE_FILES, charm._autoscaling_context)
+        _, pdb = yaml.safe_load_all(manifests[0])
+        assert pdb["spec"]["maxUnavailable"] == 1
+        assert "minAvailable" not in pdb["spec"]
+
+        harness.update_config({"autoscaling": False})
+        manifests = charm._render_templates(AUTOSCALING_RESOURCE_FILES, charm._autoscaling_context)
+        assert not list(yaml.safe_load_all(manifests[0]))
+
+    @patch("charm.KubeflowDashboardOperator.autoscaling_resource_handler")
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
+    def test_autoscaling_resources_reconciled(
+        self, autoscaling_resource_handler: MagicMock, harness_with_profiles: Harness
+    ):
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        # Never enabled, so there is nothing to reconcile
+        harness_with_profiles.charm.on.config_changed.emit()
+        autoscaling_resource_handler.reconcile.assert_not_called()
+
+        with patch("charm.KubeflowDashboardOperator.lightkube_client"):
+            harness_with_profiles.update_config({"autoscaling": True, "cpu-request": "100m"})
+        autoscaling_resource_handler.reconcile.assert_called_once()
+
+        # Disabling it deletes the resources once
+        harness_with_profiles.update_config({"autoscaling": False})
+        assert autoscaling_resource_handler.reconcile.call_count == 2
+        harness_with_profiles.update_config({"cpu-request": "200m"})
+        assert autoscaling_resource_handler.reconcile.call_count == 2
+
+    @pytest.mark.parametrize(
+        "config, message",
+        [
+            ({}, "autoscaling requires cpu-request to be set"),
+            (
+                {"cpu-request": "1", "autoscaling-min-replicas": 4},
+                "autoscaling-min-replicas must be between 1 and autoscaling-max-replicas",
+            ),
+            (
+                {"cpu-request": "1", "autoscaling-target-cpu-utilization": 0},
+                "autoscaling-target-cpu-utilization must be greater than 0",
+            ),
+        ],
+    )
+    def test_invalid_autoscaling_config(
+        self, config: dict, message: str, harness_with_profiles: Harness
+    ):
+        harness_with_profiles.update_config({"autoscaling": True, **config})
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.config_changed.emit()
+
+        assert harness_with_profiles.charm.model.unit.status == BlockedStatus(message)
+
+    def test_traffic_policy_manifests(self, harness: Harness):
+        harness.set_model_name("a-model")
+        harness.update_config(
+            {
+                "traffic-policy": True,
+                "traffic-policy-max-connections": 100,
+                "traffic-policy-max-retries": 2,
+            }
+        )
+        harness.begin()
+        charm = harness.charm
+
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+
+        (destination_rule,) = yaml.safe_load_all(manifests[0])
+        assert destination_rule["kind"] == "DestinationRule"
+        assert destination_rule["spec"]["host"] == f"{charm.app.name}.a-model.svc.cluster.local"
+        traffic_policy = destination_rule["spec"]["trafficPolicy"]
+        assert traffic_policy["connectionPool"] == {
+            "tcp": {"maxConnections": 100, "connectTimeout": "10s"},
+            "http": {"http1MaxPendingRequests": 1024, "maxRetries": 2},
+        }
+        assert "outlierDetection" not in traffic_policy
+
+        harness.update_config({"traffic-policy-consecutive-5xx-errors": 5})
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+        (destination_rule,) = yaml.safe_load_all(manifests[0])
+        assert destination_rule["spec"]["trafficPolicy"]["outlierDetection"] == {
+            "consecutive5xxErrors": 5,
+            "interval": "10s",
+            "baseEjectionTime": "30s",
+        }
+
+        harness.update_config({"traffic-policy": False})
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+        assert not list(yaml.safe_load_all(manifests[0]))
+
+    def test_gateway_filters_manifests(self, harness: Harness):
+        harness.update_config({"compression": True, "assets-cache-max-age": 31536000})
+        harness.begin()
+        charm = harness.charm
+
+        # There is no gateway to apply the filters to without the istio-ingress-route relation
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+        assert not list(yaml.safe_load_all(manifests[1]))
+
+        harness.add_relation("istio-ingress-route", "istio-ingress-k8s")
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+
+        (envoy_filter,) = yaml.safe_load_all(manifests[1])
+        assert envoy_filter["kind"] == "EnvoyFilter"
+        assert envoy_filter["spec"]["workloadSelector"]["labels"] == {
+            "gateway.networking.k8s.io/gateway-name": "istio-ingress-k8s"
+        }
+        filters = [patch["patch"]["value"] for patch in envoy_filter["spec"]["configPatches"]]
+        assert [f["name"] for f in filters] == [
+            "envoy.filters.http.compressor.gzip",
+            "envoy.filters.http.compressor.brotli",
+            "envoy.filters.http.lua",
+        ]
+        lua_code = filters[2]["typed_config"]["default_source_code"]["inline_string"]
+        assert "public, max-age=31536000, immutable" in lua_code
+
+        harness.update_config({"compression": False})
+        manifests = charm._render_templates(
+            TRAFFIC_POLICY_RESOURCE_FILES, charm._traffic_policy_context
+        )
+        (envoy_filter,) = yaml.safe_load_all(manifests[1])
+        assert [
+            patch["patch"]["value"]["name"] for patch in envoy_filter["spec"]["configPatches"]
+        ] == ["envoy.filters.http.lua"]
+
+    @patch("charm.KubeflowDashboardOperator.traffic_policy_resource_handler")
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
+    def test_traffic_policy_resources_reconciled(
+        self, traffic_policy_resource_handler: MagicMock, harness_with_profiles: Harness
+    ):
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        # Never enabled, so there is nothing to reconcile
+        harness_with_profiles.charm.on.config_changed.emit()
+        traffic_policy_resource_handler.reconcile.assert_not_called()
+
+        harness_with_profiles.update_config({"traffic-policy": True})
+        traffic_policy_resource_handler.reconcile.assert_called_once()
+
+        # Disabling it deletes the resources once
+        harness_with_profiles.update_config({"traffic-policy": False})
+        assert traffic_policy_resource_handler.reconcile.call_count == 2
+        harness_with_profiles.update_config({"traffic-policy-max-retries": 5})
+        assert traffic_policy_resource_handler.reconcile.call_count == 2
+
+    @pytest.mark.parametrize(
+        "config, message",
+        [
+            (
+                {"traffic-policy-max-connections": 0},
+                "traffic-policy-max-connections must be greater than 0",
+            ),
+            (
+                {"traffic-policy-consecutive-5xx-errors": -1},
+                "traffic-policy-consecutive-5xx-errors must not be negative",
+            ),
+            (
+                {"traffic-policy-connect-timeout": "10"},
+                "traffic-policy-connect-timeout '10' is not a valid duration",
+            ),
+            ({"assets-cache-max-age": -1}, "assets-cache-max-age must not be negative"),
+        ],
+    )
+    def test_invalid_traffic_policy_config(
+        self, config: dict, message: str, harness_with_profiles: Harness
+    ):
+        harness_with_profiles.update_config({"traffic-policy": True, **config})
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.config_changed.emit()
+
+        assert harness_with_profiles.charm.model.unit.status == BlockedStatus(message)
+
+    @patch("charm.KubeflowDashboardOperator.lightkube_client")
+    @patch("charm.KubeflowDashboardOperator.autoscaling_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
+    def test_autoscaling_reports_scale_disagreement(
+        self, lightkube_client: MagicMock, harness_with_profiles: Harness
+    ):
+        hpa = HorizontalPodAutoscaler(status=HorizontalPodAutoscalerStatus(desiredReplicas=1))
+        lightkube_client.get.return_value = hpa
+        harness_with_profiles.set_planned_units(1)
+        harness_with_profiles.update_config({"autoscaling": True, "cpu-request": "100m"})
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.config_changed.emit()
+        assert harness_with_profiles.charm.model.unit.status == ActiveStatus("cpu: 100m/-")
+        lightkube_client.get.assert_called_with(
+            HorizontalPodAutoscaler, harness_with_profiles.charm.app.name, namespace="a-model"
+        )
+
+        hpa.status.desiredReplicas = 3
+        harness_with_profiles.charm.on.update_status.emit()
+        assert harness_with_profiles.charm.model.unit.status == ActiveStatus(
+            "cpu: 100m/-; HPA wants 3 units, Juju scale is 1"
+        )
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            {"nodejs-max-old-space-size": -1},
+            {"uv-threadpool-size": 0},
+            {"uv-threadpool-size": 1025},
+        ],
+    )
+    @patch("charm.KubeflowDashboardOperator.configmap_handler")
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
+    def test_invalid_nodejs_config(
+        self,
+        k8s_resource_handler: MagicMock,
+        configmap_handler: MagicMock,
+        config: dict,
+        harness_with_profiles: Harness,
+    ):
+        harness_with_profiles.update_config(config)
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.config_changed.emit()
+
+        assert isinstance(harness_with_profiles.charm.model.unit.status, BlockedStatus)
+        assert next(iter(config)) in harness_with_profiles.charm.model.unit.status.message
+        k8s_resource_handler.apply.assert_not_called()
+        assert not container.get_plan().services
+
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     def test_deploy_k8s_resources_success(
@@ -170,7 +552,6 @@ class TestCharm:
         configmap_handler.apply.assert_called()
         assert isinstance(harness_with_profiles.charm.model.unit.status, ActiveStatus)
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     def test_create_resources_success(
@@ -187,7 +568,6 @@ class TestCharm:
         configmap_handler.apply.assert_called_once()
         assert isinstance(harness_with_profiles.charm.model.unit.status, ActiveStatus)
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     @patch("charm.KubeflowDashboardOperator._update_layer")
@@ -210,10 +590,109 @@ class TestCharm:
         actual_links = json.loads(harness_with_profiles.charm._context["menuLinks"])
         assert actual_links == expected_links
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
+    @patch("charm.KubeflowDashboardOperator.configmap_handler")
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
+    @patch("charm.KubeflowDashboardOperator._update_layer")
+    def test_main_skips_reconcile_when_desired_state_unchanged(
+        self,
+        update_layer: MagicMock,
+        k8s_resource_handler: MagicMock,
+        configmap_handler: MagicMock,
+        harness_with_profiles: Harness,
+    ):
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        # First reconcile applies the desired state, the second one is a no-op
+        harness_with_profiles.charm.on.config_changed.emit()
+        harness_with_profiles.charm.on.config_changed.emit()
+        k8s_resource_handler.apply.assert_called_once()
+        configmap_handler.apply.assert_called_once()
+        update_layer.assert_called_once()
+        assert harness_with_profiles.charm._stored.reconciles_executed == 1
+        assert harness_with_profiles.charm._stored.reconciles_skipped == 1
+        assert isinstance(harness_with_profiles.charm.model.unit.status, ActiveStatus)
+
+        # Changing an input of the rendered manifests triggers a new reconcile
+        harness_with_profiles.update_config(
+            {ADDITIONAL_LINKS_CONFIG_NAME["menu"]: '[{"text": "1", "link": "/1"}]'}
+        )
+        assert k8s_resource_handler.apply.call_count == 2
+        assert harness_with_profiles.charm._stored.reconciles_executed == 2
+
+        # pebble-ready always reconciles, as the workload may have lost its plan
+        harness_with_profiles.container_pebble_ready(CHARM_NAME)
+        assert update_layer.call_count == 3
+        assert harness_with_profiles.charm._stored.reconciles_skipped == 1
+
+    @patch("charm._generic_resources_loaded", False)
+    @patch("lightkube.generic_resource.load_in_cluster_generic_resources")
+    @patch("lightkube.Client")
+    @patch("charm.KubeflowDashboardOperator._update_layer")
+    def test_main_reuses_client_and_context(
+        self,
+        update_layer: MagicMock,
+        client_cls: MagicMock,
+        load_in_cluster_generic_resources: MagicMock,
+        harness_with_profiles: Harness,
+    ):
+        """Tests that the charm creates one lightkube Client and computes the context once.
+
+        The dashboard ConfigMap rendered for the reconcile fingerprint is also the one applied.
+        """
+        harness_with_profiles.set_planned_units(0)
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        with patch.object(
+            harness_with_profiles.charm,
+            "_get_dashboard_links",
+            wraps=harness_with_profiles.charm._get_dashboard_links,
+        ) as get_dashboard_links, patch(
+            "dashboard_configmap.render_configmap_data",
+            wraps=dashboard_configmap.render_configmap_data,
+        ) as render_configmap_data:
+            harness_with_profiles.charm.on.install.emit()
+            harness_with_profiles.charm.on.remove.emit()
+
+        assert isinstance(harness_with_profiles.charm.model.unit.status, MaintenanceStatus)
+        client_cls.assert_called_once()
+        load_in_cluster_generic_resources.assert_called_once_with(client_cls.return_value)
+        get_dashboard_links.assert_called_once()
+        render_configmap_data.assert_called_once()
+        assert client_cls.return_value.apply.called
+        assert client_cls.return_value.delete.called
+
+    @patch("charm.KubeflowDashboardOperator.configmap_handler")
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
+    @patch("charm.KubeflowDashboardOperator._update_layer")
+    @patch("dashboard_configmap.MAX_CONFIGMAP_SIZE_BYTES", 10)
+    def test_main_blocked_when_configmap_too_large(
+        self,
+        update_layer: MagicMock,
+        k8s_resource_handler: MagicMock,
+        configmap_handler: MagicMock,
+        harness_with_profiles: Harness,
+    ):
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+
+        harness_with_profiles.charm.on.install.emit()
+
+        k8s_resource_handler.apply.assert_not_called()
+        configmap_handler.apply.assert_not_called()
+        update_layer.assert_not_called()
+        assert isinstance(harness_with_profiles.charm.model.unit.status, BlockedStatus)
+        assert (
+            "exceeding the 10 bytes limit" in harness_with_profiles.charm.model.unit.status.message
+        )
+
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
-    @patch("charm.delete_many")
+    @patch("charmed_kubeflow_chisme.lightkube.batch.delete_many")
     def test_on_remove_success(
         self,
         delete_many: MagicMock,
@@ -221,16 +700,46 @@ class TestCharm:
         k8s_resource_handler: MagicMock,
         harness_with_profiles: Harness,
     ):
+        harness_with_profiles.set_planned_units(0)
         harness_with_profiles.begin()
         harness_with_profiles.charm.on.remove.emit()
         k8s_resource_handler.assert_has_calls([mock.call.render_manifests()])
         configmap_handler.assert_has_calls([mock.call.render_manifests()])
         delete_many.assert_called()
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
-    @patch("charm.delete_many")
+    @patch("charmed_kubeflow_chisme.lightkube.batch.delete_many")
+    def test_on_remove_scale_down(
+        self,
+        delete_many: MagicMock,
+        configmap_handler: MagicMock,
+        k8s_resource_handler: MagicMock,
+        harness_with_profiles: Harness,
+    ):
+        """Tests that removing a unit while others remain keeps the shared resources."""
+        harness_with_profiles.set_planned_units(2)
+        harness_with_profiles.begin()
+        harness_with_profiles.charm.on.remove.emit()
+        delete_many.assert_not_called()
+
+    @patch("lightkube.Client")
+    def test_on_remove_leader_scale_down_keeps_service(
+        self, lightkube_client: MagicMock, harness_with_profiles: Harness
+    ):
+        """Tests that removing the leader while others remain does not delete the Service."""
+        harness_with_profiles.set_planned_units(2)
+        harness_with_profiles.begin_with_initial_hooks()
+        harness_with_profiles.charm.on.remove.emit()
+
+        lightkube_client.return_value.delete.assert_not_called()
+        assert harness_with_profiles.model.unit.opened_ports() == {
+            OpenedPort("tcp", harness_with_profiles.model.config["port"])
+        }
+
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
+    @patch("charm.KubeflowDashboardOperator.configmap_handler")
+    @patch("charmed_kubeflow_chisme.lightkube.batch.delete_many")
     def test_on_remove_failure(
         self,
         delete_many: MagicMock,
@@ -239,6 +748,7 @@ class TestCharm:
         harness_with_profiles: Harness,
     ):
         delete_many.side_effect = _FakeApiError()
+        harness_with_profiles.set_planned_units(0)
         harness_with_profiles.begin()
         with pytest.raises(ApiError):
             harness_with_profiles.charm.on.remove.emit()
@@ -247,7 +757,6 @@ class TestCharm:
 class TestSidebarLinks:
     """Tests for the sidebar relation."""
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     def test_context_with_sidebar_relations_no_links(
         self,
         harness_with_profiles: Harness,
@@ -258,10 +767,9 @@ class TestSidebarLinks:
         actual_links = json.loads(harness_with_profiles.charm._context["menuLinks"])
         assert actual_links == expected_links
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     @patch("charm.KubeflowDashboardOperator.configmap_handler")
-    @patch("charm.delete_many")
+    @patch("charmed_kubeflow_chisme.lightkube.batch.delete_many")
     def test_context_with_adding_and_removing_sidebar_relations(
         self,
         update_layer: MagicMock,
@@ -317,7 +825,6 @@ class TestSidebarLinks:
         ]
         assert actual_items == relations[2]["sidebar_items"]
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     def test_sidebar_relation_and_config_and_ordering_together(
         self,
         harness_with_profiles: Harness,
@@ -379,7 +886,6 @@ class TestSidebarLinks:
         ]
         assert actual_items == expected_sidebar_items_ordered
 
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
     @patch("charm.KubeflowDashboardOperator.k8s_resource_handler")
     def test_sidecar_and_ambient_relations_added(
         self, k8s_resource_handler: MagicMock, harness: Harness
@@ -402,33 +908,79 @@ class TestSidebarLinks:
             BlockedStatus,
         )
 
-    @pytest.mark.parametrize("tls_enabled, expected_port", [(False, 80), (True, 443)])
-    @patch("charm.KubernetesServicePatch", lambda x, y: None)
-    @patch("charm.IstioIngressRouteRequirer")
-    @patch("charm.ServiceMeshConsumer")
+    @pytest.mark.parametrize("tls_enabled, expected_port", [("False", 80), ("True", 443)])
+    @patch("service_mesh_consumer.MinimalPatchServiceMeshConsumer")
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
     def test_ambient_mesh_ingress(
         self,
         mock_mesh_consumer: MagicMock,
-        mock_ingress_cls: MagicMock,
-        harness: Harness,
-        tls_enabled: bool,
+        harness_with_profiles: Harness,
+        tls_enabled: str,
         expected_port: int,
     ):
         """Test that _ambient_mesh_ingress uses the correct port based on TLS setting."""
-        mock_ingress = MagicMock()
-        mock_ingress.tls_enabled = tls_enabled
-        mock_ingress_cls.return_value = mock_ingress
+        rel_id = harness_with_profiles.add_relation(
+            "istio-ingress-route", "istio-ingress-k8s", app_data={"tls_enabled": tls_enabled}
+        )
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
 
-        harness.add_relation("istio-ingress-route", "istio-ingress-k8s")
-        harness.set_leader(True)
-        harness.begin()
+        # The route config is submitted by the reconcile, not when the charm is created
+        assert "config" not in harness_with_profiles.get_relation_data(rel_id, CHARM_NAME)
+        harness_with_profiles.charm.on.config_changed.emit()
 
-        mock_ingress.submit_config.assert_called_once()
-        config = mock_ingress.submit_config.call_args[0][0]
+        app_data = harness_with_profiles.get_relation_data(rel_id, CHARM_NAME)
+        config = IstioIngressRouteConfig.model_validate_json(app_data["config"])
         assert len(config.listeners) == 1
         assert config.listeners[0].port == expected_port
         assert config.listeners[0].protocol == ProtocolType.HTTP
 
+    def test_ambient_mesh_ingress_submitted_before_workload_checks(self, harness: Harness):
+        """Test the route config is submitted while the workload is not ready yet."""
+        harness.set_leader(True)
+        rel_id = harness.add_relation("istio-ingress-route", "istio-ingress-k8s")
+        harness.begin()
+
+        harness.charm.on.config_changed.emit()
+
+        assert harness.charm.model.unit.status == MaintenanceStatus("Pod startup is not complete")
+        assert "config" in harness.get_relation_data(rel_id, CHARM_NAME)
+
+    @patch("charm.KubeflowDashboardOperator.configmap_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator.k8s_resource_handler", MagicMock())
+    @patch("charm.KubeflowDashboardOperator._update_layer", MagicMock())
+    def test_ambient_mesh_ingress_submitted_on_change(self, harness_with_profiles: Harness):
+        """Test the route config is only written to the relation when it changes."""
+        rel_id = harness_with_profiles.add_relation("istio-ingress-route", "istio-ingress-k8s")
+        harness_with_profiles.begin()
+        container = harness_with_profiles.charm.model.unit.get_container(CHARM_NAME)
+        harness_with_profiles.set_can_connect(container, True)
+        harness_with_profiles.charm.on.config_changed.emit()
+
+        def get_listener_port() -> int:
+            app_data = harness_with_profiles.get_relation_data(rel_id, CHARM_NAME)
+            return json.loads(app_data["config"])["listeners"][0]["port"]
+
+        assert get_listener_port() == 80
+
+        with patch.object(
+            harness_with_profiles.charm.ingress,
+            "submit_config",
+            wraps=harness_with_profiles.charm.ingress.submit_config,
+        ) as submit_config:
+            harness_with_profiles.charm.on.upgrade_charm.emit()
+            submit_config.assert_not_called()
+
+            # Enabling TLS on the gateway changes the listener
+            harness_with_profiles.update_relation_data(
+                rel_id, "istio-ingress-k8s", {"tls_enabled": "True"}
+            )
+            submit_config.assert_called_once()
+        assert get_listener_port() == 443
+
 
 def add_sidebar_relation(harness: Harness, other_app_name: str):
     """Adds a sidebar relation to a harness."""
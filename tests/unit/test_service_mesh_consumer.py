@@ -0,0 +1,243 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from charms.istio_beacon_k8s.v0.service_mesh import ServiceMeshConsumer
+from lightkube import ApiError
+from lightkube.models.apps_v1 import StatefulSetSpec
+from lightkube.models.core_v1 import PodTemplateSpec
+from lightkube.models.meta_v1 import LabelSelector, ObjectMeta
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.resources.core_v1 import ConfigMap, Service
+from ops.model import RelationDataContent
+from ops.testing import Harness
+
+import service_mesh_consumer
+from service_mesh_consumer import get_labels_patch, reconcile_charm_labels
+
+APP_NAME = "kubeflow-dashboard"
+NAMESPACE = "a-model"
+CONFIGMAP_NAME = f"juju-service-mesh-{APP_NAME}-labels"
+MESH_LABELS = {"istio.io/dataplane-mode": "ambient"}
+CMR_DATA = {"app_name": "prometheus", "juju_model_name": "cos"}
+
+
+class _FakeResponse:
+    """Used to fake an httpx response during testing only."""
+
+    def __init__(self, code):
+        self.code = code
+
+    def json(self):
+        return {"apiVersion": 1, "code": self.code, "message": "", "reason": ""}
+
+
+@pytest.fixture
+def harness(unstarted_leader_harness: Harness) -> Harness:
+    """Returns a started leader Harness related to a service mesh."""
+    # ServiceMeshConsumer gets its relation when it is created
+    unstarted_leader_harness.add_relation("service-mesh", "istio-beacon-k8s")
+    unstarted_leader_harness.begin()
+    return unstarted_leader_harness
+
+
+def make_client(stored_labels, template_labels, service_labels) -> MagicMock:
+    """Returns a mocked lightkube client holding the given labels.
+
+    stored_labels is None if the label ConfigMap does not exist.
+    """
+    objects = {
+        StatefulSet: StatefulSet(
+            spec=StatefulSetSpec(
+                selector=LabelSelector(),
+                serviceName=APP_NAME,
+                template=PodTemplateSpec(metadata=ObjectMeta(labels=template_labels)),
+            )
+        ),
+        Service: Service(metadata=ObjectMeta(labels=service_labels)),
+    }
+    if stored_labels is not None:
+        objects[ConfigMap] = ConfigMap(data={"labels": json.dumps(stored_labels)})
+
+    def get(res, name, namespace=None):
+        if res not in objects:
+            raise ApiError(response=_FakeResponse(404))
+        return objects[res]
+
+    client = MagicMock()
+    client.get.side_effect = get
+    return client
+
+
+def get_patches(client: MagicMock) -> dict:
+    """Returns the patch bodies sent by client, by resource type."""
+    return {call.args[0]: call.args[2] for call in client.patch.call_args_list}
+
+
+@pytest.mark.parametrize(
+    "current_labels, expected_patch",
+    [
+        (None, {"a": "1"}),
+        ({"a": "1", "b": "2"}, {}),
+        ({"a": "0", "b": "2"}, {"a": "1"}),
+        ({"a": "1", "b": "2", "c": "3"}, {"c": None}),
+    ],
+)
+def test_get_labels_patch(current_labels, expected_patch):
+    assert get_labels_patch(current_labels, {"a": "1", "c": None}) == expected_patch
+
+
+def test_reconcile_charm_labels_unchanged():
+    client = make_client(MESH_LABELS, {"app": APP_NAME, **MESH_LABELS}, MESH_LABELS)
+
+    gets, writes = reconcile_charm_labels(client, APP_NAME, NAMESPACE, CONFIGMAP_NAME, MESH_LABELS)
+
+    assert (gets, writes) == (3, 0)
+    client.patch.assert_not_called()
+    client.create.assert_not_called()
+
+
+def test_reconcile_charm_labels_added():
+    client = make_client(None, {"app": APP_NAME}, None)
+
+    gets, writes = reconcile_charm_labels(client, APP_NAME, NAMESPACE, CONFIGMAP_NAME, MESH_LABELS)
+
+    assert (gets, writes) == (3, 4)
+    client.create.assert_called_once_with(
+        ConfigMap(
+            data={"labels": "{}"},
+            metadata=ObjectMeta(name=CONFIGMAP_NAME, namespace=NAMESPACE),
+        )
+    )
+    assert get_patches(client) == {
+        StatefulSet: {"spec": {"template": {"metadata": {"labels": MESH_LABELS}}}},
+        Service: {"metadata": {"labels": MESH_LABELS}},
+        ConfigMap: {"data": {"labels": json.dumps(MESH_LABELS)}},
+    }
+
+
+def test_reconcile_charm_labels_removed():
+    # The Service labels were already removed by a previous, interrupted, call
+    client = make_client(MESH_LABELS, {"app": APP_NAME, **MESH_LABELS}, {})
+
+    gets, writes = reconcile_charm_labels(client, APP_NAME, NAMESPACE, CONFIGMAP_NAME, {})
+
+    assert (gets, writes) == (3, 2)
+    assert get_patches(client) == {
+        StatefulSet: {
+            "spec": {"template": {"metadata": {"labels": {"istio.io/dataplane-mode": None}}}}
+        },
+        ConfigMap: {"data": {"labels": "{}"}},
+    }
+
+
+def test_mesh_relation_changed_only_patches_changed_labels(harness: Harness):
+    client = make_client(MESH_LABELS, {"app": APP_NAME, **MESH_LABELS}, MESH_LABELS)
+    harness.charm._lightkube_client = client
+    rel_id = harness.model.get_relation("service-mesh").id
+
+    harness.update_relation_data(
+        rel_id,
+        "istio-beacon-k8s",
+        {"labels": json.dumps(MESH_LABELS), "mesh_type": json.dumps("istio")},
+    )
+
+    assert client.get.call_count == 3
+    client.patch.assert_not_called()
+
+
+def test_mesh_shares_the_charm_lightkube_client(harness: Harness):
+    client = make_client(MESH_LABELS, {"app": APP_NAME, **MESH_LABELS}, MESH_LABELS)
+    rel_id = harness.model.get_relation("service-mesh").id
+
+    with patch("lightkube.Client", return_value=client) as client_cls, patch(
+        "charms.istio_beacon_k8s.v0.service_mesh.Client"
+    ) as library_client_cls:
+        for labels in [MESH_LABELS, {}]:
+            harness.update_relation_data(
+                rel_id,
+                "istio-beacon-k8s",
+                {"labels": json.dumps(labels), "mesh_type": json.dumps("istio")},
+            )
+        assert harness.charm._mesh.lightkube_client is harness.charm.lightkube_client
+
+    client_cls.assert_called_once()
+    library_client_cls.assert_not_called()
+    # Both relation-changed events read the label ConfigMap, StatefulSet and Service
+    assert client.get.call_count == 6
+
+
+def test_unchanged_policies_are_not_built_or_written_again(harness: Harness):
+    mesh_rel_id = harness.model.get_relation("service-mesh").id
+    harness.add_relation("metrics-endpoint", "prometheus")
+    policies = json.loads(harness.get_relation_data(mesh_rel_id, APP_NAME)["policies"])
+    assert [policy["source_app_name"] for policy in policies] == ["prometheus"]
+
+    with patch.object(
+        service_mesh_consumer,
+        "build_mesh_policies",
+        wraps=service_mesh_consumer.build_mesh_policies,
+    ) as build_mesh_policies, patch.object(
+        RelationDataContent,
+        "__setitem__",
+        autospec=True,
+        side_effect=RelationDataContent.__setitem__,
+    ) as relation_data_setitem:
+        harness.charm.on.upgrade_charm.emit()
+        build_mesh_policies.assert_not_called()
+        assert "policies" not in [call.args[1] for call in relation_data_setitem.call_args_list]
+
+        harness.add_relation("metrics-endpoint", "other-prometheus")
+        build_mesh_policies.assert_called_once()
+
+    policies = json.loads(harness.get_relation_data(mesh_rel_id, APP_NAME)["policies"])
+    assert sorted(policy["source_app_name"] for policy in policies) == [
+        "other-prometheus",
+        "prometheus",
+    ]
+
+
+def test_unchanged_cmr_data_is_not_validated_again(unstarted_leader_harness: Harness):
+    harness = unstarted_leader_harness
+    # ServiceMeshConsumer gets its relations when it is created
+    mesh_rel_id = harness.add_relation("service-mesh", "istio-beacon-k8s")
+    cmr_rel_id = harness.add_relation("provide-cmr-mesh", "remote-prometheus")
+    harness.begin()
+    harness.add_relation("metrics-endpoint", "remote-prometheus")
+
+    with patch.object(
+        service_mesh_consumer.CMRData,
+        "model_validate",
+        wraps=service_mesh_consumer.CMRData.model_validate,
+    ) as model_validate:
+        harness.update_relation_data(
+            cmr_rel_id, "remote-prometheus", {"cmr_data": json.dumps(CMR_DATA)}
+        )
+        harness.add_relation("metrics-endpoint", "other-prometheus")
+
+    model_validate.assert_called_once()
+    policies = json.loads(harness.get_relation_data(mesh_rel_id, APP_NAME)["policies"])
+    assert sorted(
+        (policy["source_namespace"], policy["source_app_name"]) for policy in policies
+    ) == [(NAMESPACE, "other-prometheus"), ("cos", "prometheus")]
+
+
+def test_policies_match_service_mesh_consumer(unstarted_leader_harness: Harness):
+    """Tests the policies are the same as the ones written by ServiceMeshConsumer."""
+    harness = unstarted_leader_harness
+    # ServiceMeshConsumer gets its relations when it is created
+    mesh_rel_id = harness.add_relation("service-mesh", "istio-beacon-k8s")
+    cmr_rel_id = harness.add_relation("provide-cmr-mesh", "remote-prometheus")
+    harness.begin()
+    harness.add_relation("metrics-endpoint", "remote-prometheus")
+    harness.add_relation("metrics-endpoint", "other-prometheus")
+    harness.update_relation_data(
+        cmr_rel_id, "remote-prometheus", {"cmr_data": json.dumps(CMR_DATA)}
+    )
+    policies = harness.get_relation_data(mesh_rel_id, APP_NAME)["policies"]
+
+    ServiceMeshConsumer.update_service_mesh(harness.charm._mesh)
+
+    assert harness.get_relation_data(mesh_rel_id, APP_NAME)["policies"] == policies
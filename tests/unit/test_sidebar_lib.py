@@ -81,6 +81,34 @@ class TestDashboardLink:
                 desc="",
             )
 
+    def test_to_dict_and_to_json(self):
+        dashboard_link = DashboardLink(
+            text="text", link="/link", location="menu", icon="icon", type="type", desc="desc"
+        )
+
+        assert dashboard_link.to_dict() == asdict(dashboard_link)
+        assert list(dashboard_link.to_dict()) == list(asdict(dashboard_link))
+        assert dashboard_link.to_json() == json.dumps(asdict(dashboard_link))
+
+    def test_is_mutable_and_slotted(self):
+        dashboard_link = DashboardLink(text="text", link="/link", location="menu")
+
+        dashboard_link.text = "other"
+
+        assert dashboard_link.text == "other"
+        assert not hasattr(dashboard_link, "__dict__")
+
+    def test_repeated_fields_are_interned(self):
+        # Build the strings at runtime so they are not interned by the compiler
+        location, icon, item_type = ("".join(value) for value in ("menu", "icon", "item"))
+        first = DashboardLink(text="1", link="/1", location=location, icon=icon, type=item_type)
+        location, icon, item_type = ("".join(value) for value in ("menu", "icon", "item"))
+        second = DashboardLink(text="2", link="/2", location=location, icon=icon, type=item_type)
+
+        assert first.location is second.location
+        assert first.icon is second.icon
+        assert first.type is second.type
+
 
 class TestProvider:
     def test_get_dashboard_links(self):
@@ -203,6 +231,65 @@ class TestProvider:
         # Assert
         assert actual_dashboard_menu_links == expected_dashboard_menu_links
 
+    def test_get_dashboard_links_by_location(self):
+        """Tests that get_dashboard_links_by_location groups relation links by location."""
+        # Arrange
+        # Set up charm
+        other_app = "other"
+        harness = Harness(DummyProviderCharm, meta=DUMMY_PROVIDER_METADATA)
+
+        # Create data, including multiple location values
+        dashboard_menu_links = [
+            DashboardLink(
+                text=f"text{i}-menu",
+                link=f"link{i}-menu",
+                type=f"type{i}-menu",
+                icon=f"icon{i}-menu",
+                location="menu",
+            )
+            for i in range(3)
+        ]
+        dashboard_documentation_links = [
+            DashboardLink(
+                text=f"text{i}-documentation",
+                link=f"link{i}-documentation",
+                type=f"type{i}-documentation",
+                icon=f"icon{i}-documentation",
+                location="documentation",
+            )
+            for i in range(3)
+        ]
+        databag = {
+            DASHBOARD_LINKS_FIELD: json.dumps(
+                [
+                    asdict(sidebar_item)
+                    for sidebar_item in dashboard_menu_links + dashboard_documentation_links
+                ]
+            )
+        }
+
+        # Add data to two relations so we simulate having two relations of data
+        for _ in range(2):
+            relation_id = harness.add_relation(RELATION_NAME, other_app)
+            harness.update_relation_data(
+                relation_id=relation_id, app_or_unit=other_app, key_values=databag
+            )
+
+        expected_dashboard_links = {
+            "menu": dashboard_menu_links * 2,
+            "external": [],
+            "quick": [],
+            "documentation": dashboard_documentation_links * 2,
+        }
+
+        harness.begin()
+
+        # Act
+        actual_dashboard_links = harness.charm.sidebar_provider.get_dashboard_links_by_location()
+
+        # Assert
+        assert actual_dashboard_links == expected_dashboard_links
+
     def test_get_dashboard_links_from_empty_relation(self):
         """Tests that get_sidebar_items correctly handles empty relations."""
         # Arrange
@@ -0,0 +1,140 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from lightkube import ApiError
+from lightkube.models.apps_v1 import StatefulSetSpec
+from lightkube.models.core_v1 import Container, PodSpec, PodTemplateSpec, ResourceRequirements
+from lightkube.models.meta_v1 import LabelSelector
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.types import PatchType
+from ops.model import BlockedStatus
+from ops.testing import Harness
+
+from charm import CheckFailed
+from statefulset_resources_patch import format_resource_requirements, get_resource_requirements
+
+CONTAINER_NAME = "kubeflow-dashboard"
+EMPTY_CONFIG = {"cpu-request": "", "cpu-limit": "", "memory-request": "", "memory-limit": ""}
+
+
+def make_statefulset(resources: ResourceRequirements) -> StatefulSet:
+    """Returns a StatefulSet running the dashboard container with the given resources."""
+    return StatefulSet(
+        spec=StatefulSetSpec(
+            selector=LabelSelector(),
+            serviceName="kubeflow-dashboard",
+            template=PodTemplateSpec(
+                spec=PodSpec(
+                    containers=[
+                        Container(name="charm"),
+                        Container(name=CONTAINER_NAME, resources=resources),
+                    ]
+                )
+            ),
+        )
+    )
+
+
+@pytest.fixture
+def harness(leader_harness: Harness) -> Harness:
+    """Returns a started leader Harness using a mocked lightkube client."""
+    leader_harness.charm._lightkube_client = MagicMock()
+    return leader_harness
+
+
+def test_get_resource_requirements():
+    config = {**EMPTY_CONFIG, "cpu-request": "100m", "cpu-limit": "1", "memory-limit": "1Gi "}
+
+    resource_reqs = get_resource_requirements(config)
+
+    assert resource_reqs == ResourceRequirements(
+        requests={"cpu": "100m"}, limits={"cpu": "1", "memory": "1Gi"}
+    )
+    assert format_resource_requirements(resource_reqs) == "cpu: 100m/1, memory: -/1Gi"
+    assert format_resource_requirements(get_resource_requirements(EMPTY_CONFIG)) == ""
+
+
+@pytest.mark.parametrize(
+    "config, error",
+    [
+        ({"cpu-request": "one"}, "cpu-request 'one' is not a valid quantity"),
+        ({"memory-limit": "0"}, "memory-limit '0' must be greater than 0"),
+        ({"cpu-request": "2", "cpu-limit": "1500m"}, "cpu request '2' is greater than"),
+    ],
+)
+def test_get_resource_requirements_invalid(config: dict, error: str):
+    with pytest.raises(ValueError, match=error):
+        get_resource_requirements({**EMPTY_CONFIG, **config})
+
+
+def test_patch_changed_resources(harness: Harness):
+    client = harness.charm._lightkube_client
+    client.get.return_value = make_statefulset(ResourceRequirements(limits={"cpu": "2"}))
+    harness.update_config({"cpu-limit": "1", "memory-request": "256Mi"})
+
+    client.patch.assert_called_once()
+    assert client.patch.call_args.args[:2] == (StatefulSet, harness.charm.app.name)
+    assert client.patch.call_args.kwargs["patch_type"] == PatchType.STRATEGIC
+    body = client.patch.call_args.args[2]
+    assert body["spec"]["template"]["spec"]["containers"] == [
+        {
+            "name": CONTAINER_NAME,
+            "resources": {
+                "requests": {"cpu": None, "memory": "256Mi"},
+                "limits": {"cpu": "1", "memory": None},
+            },
+        }
+    ]
+
+
+def test_unchanged_resources_are_not_patched(harness: Harness):
+    client = harness.charm._lightkube_client
+    # Kubernetes stores quantities in their canonical form
+    client.get.return_value = make_statefulset(
+        ResourceRequirements(requests={"cpu": "500m"}, limits={"memory": "1Gi"})
+    )
+    harness.update_config({"cpu-request": "0.5", "memory-limit": "1024Mi"})
+
+    client.get.assert_called_once()
+    client.patch.assert_not_called()
+
+
+def test_invalid_resources_are_not_patched(harness: Harness):
+    client = harness.charm._lightkube_client
+    harness.update_config({"cpu-request": "2", "cpu-limit": "1"})
+
+    client.get.assert_not_called()
+    client.patch.assert_not_called()
+
+
+def test_applied_resources_are_reported(harness: Harness):
+    client = harness.charm._lightkube_client
+    client.get.return_value = make_statefulset(ResourceRequirements())
+    harness.update_config({"cpu-request": "100m"})
+
+    assert harness.charm.resources_patcher.failure == ""
+    assert harness.charm._get_resources_status_message() == "cpu: 100m/-"
+
+
+def test_failed_patch_is_not_reported_as_applied(harness: Harness):
+    client = harness.charm._lightkube_client
+    client.get.return_value = make_statefulset(ResourceRequirements())
+    client.patch.side_effect = ApiError(
+        response=httpx.Response(403, json={"code": 403, "message": "forbidden"})
+    )
+    harness.update_config({"cpu-request": "100m"})
+
+    assert harness.charm.resources_patcher.failure == "`juju trust` this application"
+    with pytest.raises(CheckFailed) as e:
+        harness.charm._get_resources_status_message()
+    assert e.value.status == BlockedStatus(
+        "Failed to patch the container resources: `juju trust` this application"
+    )
+
+    # The failure is cleared once the resources are applied
+    client.patch.side_effect = None
+    harness.update_config({"cpu-request": "200m"})
+    assert harness.charm._get_resources_status_message() == "cpu: 200m/-"